@@ -0,0 +1,141 @@
+"""
+Opt-in export sinks for frames loaded by access.data() and assess.data().
+
+Nothing is written unless a sink is passed as export_to=. Exports are copied and
+written in order on one background thread, off the loading path; flush_exports()
+waits for them.
+"""
+import os
+import shutil
+import logging
+import threading
+import itertools
+from abc import ABC, abstractmethod
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Union
+
+import pandas as pd
+
+from frame_cache import save_frame
+
+logger = logging.getLogger(__name__)
+
+
+class ExportSink(ABC):
+    """
+    Destination for frames exported by access.data() and assess.data() for inspection.
+    Subclasses implement write(name, df); export() runs it on a background thread.
+    """
+
+    @abstractmethod
+    def write(self, name: str, df: pd.DataFrame) -> None:
+        """Write the frame df under name, e.g. as <folder>/<name>.csv."""
+
+
+class CSVSink(ExportSink):
+    """Write <folder>/<name>.csv, the index included unless it is a RangeIndex."""
+
+    def __init__(self, folder: str = ".") -> None:
+        self.folder = folder
+
+    def write(self, name: str, df: pd.DataFrame) -> None:
+        os.makedirs(self.folder, exist_ok=True)
+        path = os.path.join(self.folder, f"{name}.csv")
+        tmp = f"{path}.tmp-{threading.get_ident()}"
+        df.to_csv(tmp, index=not isinstance(df.index, pd.RangeIndex))
+        os.replace(tmp, path)
+
+
+class BinarySink(ExportSink):
+    """Write <folder>/<name>/ with save_frame(), to be read back with load_frame()."""
+
+    def __init__(self, folder: str = ".") -> None:
+        self.folder = folder
+
+    def write(self, name: str, df: pd.DataFrame) -> None:
+        path = os.path.join(self.folder, name)
+        tmp = f"{path}.tmp-{threading.get_ident()}"
+        save_frame(df, tmp)
+        shutil.rmtree(path, ignore_errors=True)
+        os.rename(tmp, path)
+
+
+class ArtifactSink(ExportSink):
+    """
+    Write every export of one run into its own folder, <root>/<timestamp>-<pid>-<n>,
+    so concurrent runs never overwrite each other's files.
+
+    Args:
+        root (str, optional): Folder holding the run folders. Defaults to "artifacts".
+        binary (bool, optional): Write save_frame() folders instead of CSVs.
+    """
+
+    _runs = itertools.count()
+
+    def __init__(self, root: str = "artifacts", binary: bool = False) -> None:
+        run = f"{datetime.now().strftime('%Y-%m-%d-%H%M%S')}-{os.getpid()}-{next(self._runs)}"
+        self.folder = os.path.join(root, run)
+        self._sink = BinarySink(self.folder) if binary else CSVSink(self.folder)
+
+    def write(self, name: str, df: pd.DataFrame) -> None:
+        os.makedirs(self.folder, exist_ok=True)
+        self._sink.write(name, df)
+
+
+# One background writer, so exports stay off the loading path and are written in order
+_export_pool: Optional[ThreadPoolExecutor] = None
+_export_lock = threading.Lock()
+_pending_exports: list = []
+
+
+def _write_export(sink: ExportSink, name: str, df: pd.DataFrame) -> None:
+    try:
+        sink.write(name, df)
+        logger.info(f"Exported {name} ({len(df)} rows) to {type(sink).__name__}")
+    except Exception as e:
+        logger.error(f"Error exporting {name} to {type(sink).__name__}: {e}")
+        raise
+
+
+def export(df: pd.DataFrame, name: str, sinks: Union[ExportSink, list, None]) -> list:
+    """
+    Hand a snapshot of a frame to export sinks, written on a background thread.
+
+    Args:
+        df (pd.DataFrame): Frame to export. It is copied, so the caller may go on to modify it.
+        name (str): Base name of the export, e.g. "x".
+        sinks (ExportSink or list, optional): Where to write it. None exports nothing.
+
+    Returns:
+        list: concurrent.futures.Future per sink; see also flush_exports().
+    """
+    global _export_pool
+    if sinks is None:
+        return []
+    if isinstance(sinks, ExportSink):
+        sinks = [sinks]
+    if not sinks:
+        return []
+    snapshot = df.copy()
+    with _export_lock:
+        if _export_pool is None:
+            _export_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="fynesse-export")
+        futures = [_export_pool.submit(_write_export, sink, name, snapshot) for sink in sinks]
+        _pending_exports[:] = [f for f in _pending_exports if not f.done()] + futures
+    return futures
+
+
+def flush_exports(timeout: Optional[float] = None) -> list:
+    """
+    Wait for the exports still being written. Returns the exceptions of failed ones.
+    """
+    with _export_lock:
+        pending = list(_pending_exports)
+        _pending_exports.clear()
+    errors = []
+    for future in pending:
+        error = future.exception(timeout=timeout)
+        if error is not None:
+            errors.append(error)
+    return errors
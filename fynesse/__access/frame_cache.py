@@ -0,0 +1,187 @@
+"""
+On-disk cache of loaded frames for access.data() and assess.data().
+
+Frames are stored as memory-mappable .npy blocks under CACHE_DIR, keyed by the session
+files' names, sizes and mtimes and the call arguments, and evicted least recently used
+past CACHE_MAX_BYTES. The FYNESSE_CACHE, FYNESSE_CACHE_DIR and FYNESSE_CACHE_MAX_BYTES
+environment variables set the defaults; the module attributes can be changed at runtime.
+"""
+import os
+import json
+import shutil
+import hashlib
+import logging
+import threading
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+# On-disk cache of loaded frames, see cache_key(). FYNESSE_CACHE=0 turns it off by default
+CACHE_DIR = os.environ.get("FYNESSE_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "fynesse"))
+CACHE_MAX_BYTES = int(os.environ.get("FYNESSE_CACHE_MAX_BYTES", 2 * 1024 ** 3))
+CACHE_ENABLED = os.environ.get("FYNESSE_CACHE", "1") != "0"
+CACHE_VERSION = 1
+CACHE_META = "meta.json"
+
+
+def _stat_key(path: str) -> list:
+    st = os.stat(path)
+    return [st.st_size, st.st_mtime_ns]
+
+
+def source_fingerprint(folder: str) -> list:
+    """
+    Name, size and mtime of every sensor file in a session folder and of sensors.json:
+    anything that changes what access.data() would load from the folder.
+    """
+    files = sorted(f for f in os.listdir(folder) if f.endswith((".csv", ".npy")))
+    fingerprint = [[f, *_stat_key(os.path.join(folder, f))] for f in files]
+    sensors_file = os.path.join("robot", "controllers", "drive_robot", "sensors.json")
+    if os.path.exists(sensors_file):
+        fingerprint.append(["sensors.json", *_stat_key(sensors_file)])
+    return fingerprint
+
+
+def cache_key(kind: str, folder: str, params: dict) -> Optional[str]:
+    """
+    Cache key of a frame computed by `kind` (e.g. "access.data") from a session folder
+    with the given call parameters, or None if the folder cannot be fingerprinted.
+    """
+    try:
+        fingerprint = source_fingerprint(folder)
+    except OSError:
+        return None
+    payload = {"version": CACHE_VERSION, "kind": kind, "folder": os.path.abspath(folder),
+               "sources": fingerprint, "params": params}
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()[:32]
+
+
+def save_frame(df: pd.DataFrame, path: str) -> int:
+    """
+    Write a frame as .npy blocks in a new directory: one Fortran-ordered 2-D block per
+    run of adjacent columns sharing a dtype, categorical codes with their categories in
+    meta.json, and the index when it is not a RangeIndex. Returns the bytes written.
+
+    Raises:
+        TypeError: For object columns, which have no binary layout here.
+    """
+    os.makedirs(path)
+    runs, start = [], 0
+    columns = list(df.columns)
+    while start < len(columns):
+        dtype = df.dtypes.iloc[start]
+        if isinstance(dtype, pd.CategoricalDtype):
+            codes = df.iloc[:, start].cat.codes.to_numpy()
+            np.save(os.path.join(path, f"run_{len(runs)}.npy"), codes)
+            runs.append({"columns": [columns[start]], "categories": dtype.categories.tolist(),
+                         "ordered": bool(dtype.ordered)})
+            start += 1
+            continue
+        if not isinstance(dtype, np.dtype) or dtype.kind == "O":
+            raise TypeError(f"Cannot cache column {columns[start]!r} of dtype {dtype}")
+        stop = start + 1
+        while stop < len(columns) and df.dtypes.iloc[stop] == dtype:
+            stop += 1
+        block = np.asfortranarray(df.iloc[:, start:stop].to_numpy(dtype=dtype))
+        np.save(os.path.join(path, f"run_{len(runs)}.npy"), block)
+        runs.append({"columns": columns[start:stop]})
+        start = stop
+
+    index = None
+    if not isinstance(df.index, pd.RangeIndex):
+        np.save(os.path.join(path, "index.npy"), df.index.to_numpy())
+        index = {"name": df.index.name}
+    meta = {"version": CACHE_VERSION, "rows": len(df), "runs": runs, "index": index}
+    with open(os.path.join(path, CACHE_META), "w") as f:
+        json.dump(meta, f)
+    return sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path))
+
+
+def load_frame(path: str) -> pd.DataFrame:
+    """
+    Load a frame written by save_frame(). Blocks are memory-mapped copy-on-write, so
+    only the pages used are read and writes to the frame never reach the cache.
+    """
+    with open(os.path.join(path, CACHE_META)) as f:
+        meta = json.load(f)
+    mmap_mode = "c" if meta["rows"] else None
+    frames = []
+    for i, run in enumerate(meta["runs"]):
+        values = np.load(os.path.join(path, f"run_{i}.npy"), mmap_mode=mmap_mode)
+        if "categories" in run:
+            dtype = pd.CategoricalDtype(run["categories"], ordered=run["ordered"])
+            frames.append(pd.DataFrame({run["columns"][0]: pd.Categorical.from_codes(values, dtype=dtype)}))
+        else:
+            frames.append(pd.DataFrame(values, columns=run["columns"], copy=False))
+    df = pd.concat(frames, axis=1, copy=False) if frames else pd.DataFrame(index=range(meta["rows"]))
+    if meta["index"] is not None:
+        df.index = pd.Index(np.load(os.path.join(path, "index.npy"), mmap_mode=mmap_mode), name=meta["index"]["name"])
+    return df
+
+
+def cache_get(key: str, cache_dir: Optional[str] = None) -> Optional[pd.DataFrame]:
+    """The cached frame for a key, memory-mapped, or None on a miss."""
+    path = os.path.join(cache_dir or CACHE_DIR, key)
+    try:
+        frame = load_frame(path)
+        # The meta file's mtime records the last use, for least-recently-used eviction
+        os.utime(os.path.join(path, CACHE_META))
+    except (OSError, ValueError, KeyError):
+        return None
+    logger.info(f"Loaded {len(frame)} rows from cache entry {key}")
+    return frame
+
+
+def cache_put(key: str, df: pd.DataFrame, cache_dir: Optional[str] = None, max_bytes: Optional[int] = None) -> None:
+    """Store a frame under a key, then evict entries past the size budget."""
+    cache_dir = cache_dir or CACHE_DIR
+    path = os.path.join(cache_dir, key)
+    tmp = f"{path}.tmp-{os.getpid()}-{threading.get_ident()}"
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        size = save_frame(df, tmp)
+        try:
+            os.rename(tmp, path)
+        except OSError:
+            # Another process stored the same entry first
+            shutil.rmtree(tmp, ignore_errors=True)
+        logger.info(f"Cached {len(df)} rows ({size / 1e6:.1f} MB) as {key}")
+    except (OSError, TypeError) as e:
+        shutil.rmtree(tmp, ignore_errors=True)
+        logger.warning(f"Could not cache frame: {e}")
+        return
+    evict_cache(cache_dir, max_bytes)
+
+
+def evict_cache(cache_dir: Optional[str] = None, max_bytes: Optional[int] = None) -> list:
+    """
+    Remove least-recently-used cache entries until the cache fits in max_bytes
+    (default CACHE_MAX_BYTES). Returns the removed keys.
+    """
+    cache_dir = cache_dir or CACHE_DIR
+    max_bytes = CACHE_MAX_BYTES if max_bytes is None else max_bytes
+    entries = []
+    for key in os.listdir(cache_dir) if os.path.isdir(cache_dir) else []:
+        path = os.path.join(cache_dir, key)
+        try:
+            last_used = os.path.getmtime(os.path.join(path, CACHE_META))
+            size = sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path))
+        except OSError:
+            continue
+        entries.append((last_used, size, key))
+    entries.sort()
+    total = sum(size for _, size, _ in entries)
+    removed = []
+    for _, size, key in entries:
+        if total <= max_bytes:
+            break
+        shutil.rmtree(os.path.join(cache_dir, key), ignore_errors=True)
+        total -= size
+        removed.append(key)
+    if removed:
+        logger.info(f"Evicted {len(removed)} cache entries to stay under {max_bytes / 1e6:.0f} MB")
+    return removed
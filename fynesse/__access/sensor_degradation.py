@@ -0,0 +1,135 @@
+"""
+Degradation profiles for the sim-to-real gap in reverse: noise, dropped readings,
+latency, jitter, drift, wear-out, salt-and-pepper and bias applied to clean sensor
+readings at load time, reproducibly for a given seed. access.data(..., degradation=...)
+applies them per sensor.
+"""
+import zlib
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+# Parameters a degradation profile may set, with the value that leaves the data untouched
+DEGRADATION_PARAMS = {
+    "gain": 1.0,  # Wear-out: multiplicative loss of response, e.g. 0.9 for a weaker motor
+    "drift_rate": 0.0,  # Wear-out: offset added per second of sim_time since the first reading
+    "bias": 0.0,  # Systematic offset
+    "gaussian_std": 0.0,  # Standard deviation of additive Gaussian noise
+    "salt_pepper_prob": 0.0,  # Probability a value saturates to its column's min or max
+    "missing_prob": 0.0,  # Probability of dropping a reading
+    "latency_rate": 1,  # Keep every n-th remaining reading to mimic a slower sensor
+    "jitter_amplitude": 0.0,  # Amplitude of a sinusoidal oscillation of sim_time
+    "jitter_freq": 0.0,  # Frequency of that oscillation in Hz
+}
+
+# The noise model transfer.py used to materialize under data/noisy
+DEFAULT_DEGRADATION = {
+    "gaussian_std": 0.1,
+    "missing_prob": 0.05,
+    "latency_rate": 2,
+    "jitter_amplitude": 0.05,
+    "jitter_freq": 10.0,
+}
+
+
+def _profile_keys(profile: dict) -> list:
+    keys = [key for key in profile if key != "sensors"]
+    for overrides in profile.get("sensors", {}).values():
+        keys += list(overrides)
+    return keys
+
+
+def sensor_profile(profile: dict, sensor_name: str) -> dict:
+    """
+    The degradation parameters for one sensor: the profile's global values updated with
+    its "sensors" overrides for that sensor, e.g. {"latency_rate": 2, "sensors": {"gps": {"latency_rate": 10}}}.
+    """
+    params = {key: value for key, value in profile.items() if key != "sensors"}
+    params.update(profile.get("sensors", {}).get(sensor_name, {}))
+    return params
+
+
+def sensor_rng(seed: int, sensor_name: str) -> np.random.Generator:
+    """
+    Random generator for one sensor's degradation. It depends only on the seed and the
+    sensor name, so a sensor degrades the same whichever other sensors are loaded.
+    """
+    return np.random.default_rng([seed, zlib.crc32(sensor_name.encode())])
+
+
+def degrade_arrays(
+    times: np.ndarray,
+    values: np.ndarray,
+    params: dict,
+    rng: np.random.Generator,
+    t_origin: Optional[float] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Degrade one sensor's clean readings to mimic real-world imperfections.
+
+    Applied in order: wear-out (gain, drift), bias, Gaussian noise, salt-and-pepper,
+    dropped readings, latency and jitter, all vectorized over the whole recording.
+
+    Args:
+        times (np.ndarray): sim_time of shape (n,).
+        values (np.ndarray): Clean values of shape (n, n_columns).
+        params (dict): Degradation parameters, see DEGRADATION_PARAMS.
+        rng (np.random.Generator): Source of randomness, see sensor_rng().
+        t_origin (float, optional): sim_time the drift grows from. Defaults to the first
+            reading; a chunk of a longer recording passes the recording's start.
+
+    Returns:
+        tuple: (times, values) of the degraded readings, values as float64.
+    """
+    p = dict(DEGRADATION_PARAMS, **params)
+    times = np.asarray(times, dtype=np.float64)
+    values = np.array(values, dtype=np.float64)
+    if len(times) == 0:
+        return times, values
+
+    # Wear-out: weaker response and a drift that grows over the session
+    if p["gain"] != 1.0:
+        values *= p["gain"]
+    if p["drift_rate"] != 0.0:
+        origin = times[0] if t_origin is None else t_origin
+        values += p["drift_rate"] * (times - origin)[:, None]
+    if p["bias"] != 0.0:
+        values += p["bias"]
+
+    if p["gaussian_std"] > 0:
+        values += rng.normal(0, p["gaussian_std"], values.shape)
+
+    # Salt-and-pepper: saturate random values to their column's extremes
+    if p["salt_pepper_prob"] > 0:
+        hit = rng.random(values.shape) < p["salt_pepper_prob"]
+        salt = rng.random(values.shape) < 0.5
+        low, high = values.min(axis=0), values.max(axis=0)
+        values = np.where(hit, np.where(salt, high, low), values)
+
+    keep = np.ones(len(times), dtype=bool)
+    if p["missing_prob"] > 0:
+        keep &= rng.random(len(times)) >= p["missing_prob"]
+    if p["latency_rate"] > 1:
+        kept = np.flatnonzero(keep)
+        keep[:] = False
+        keep[kept[::int(p["latency_rate"])]] = True
+    times = times[keep]
+    values = values[keep]
+
+    if p["jitter_amplitude"] > 0:
+        values += p["jitter_amplitude"] * np.sin(2 * np.pi * p["jitter_freq"] * times)[:, None]
+
+    return times, values
+
+
+def degrade(df: pd.DataFrame, columns: list, params: dict, rng: np.random.Generator) -> pd.DataFrame:
+    """
+    DataFrame form of degrade_arrays(): degrade a frame with a sim_time column and the
+    sensor's columns, returning the degraded sim_time and columns.
+    """
+    times, values = degrade_arrays(df["sim_time"].to_numpy(), df[columns].to_numpy(), params, rng)
+    degraded = pd.DataFrame(values, columns=columns)
+    degraded.insert(0, "sim_time", times)
+    return degraded
@@ -0,0 +1,777 @@
+"""
+Reading converted sessions: sensors.json, per-sensor CSV and typed .npy files, CSV time
+indexes, read-time sampling and memory-mapped frames, assembled into a SensorDataset.
+access.data() lays the dataset out in its long format.
+"""
+import os
+import io
+import json
+import zlib
+import hashlib
+import logging
+import threading
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+import frame_cache
+from frame_cache import _stat_key
+from sensor_degradation import DEGRADATION_PARAMS, _profile_keys, sensor_profile, sensor_rng, degrade_arrays
+
+logger = logging.getLogger(__name__)
+
+
+def _csv_engine() -> str:
+    # pyarrow's multithreaded CSV reader when it imports, otherwise pandas' C parser. An
+    # installed pyarrow can still fail to import (e.g. built for another NumPy)
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return "c"
+    return "pyarrow"
+
+
+CSV_ENGINE = _csv_engine()
+
+
+def csv_schema(s: dict) -> dict:
+    """
+    Explicit CSV dtypes for a sensor's file: float64 sim_time and float32 values.
+    """
+    schema = {"sim_time": np.float64, "value": np.float32}
+    schema.update({f"value_{i}": np.float32 for i in range(len(s["csv_columns"]))})
+    return schema
+
+
+class SensorBlock:
+    """
+    One sensor's readings as dense arrays: float64 sim_time of shape (n,) and float32
+    values of shape (n, len(columns)), with columns named as csv_columns in sensors.json.
+    """
+
+    def __init__(self, name: str, columns: list, times: np.ndarray, values: np.ndarray) -> None:
+        self.name = name
+        self.columns = list(columns)
+        self.times = times
+        self.values = values
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    def __repr__(self) -> str:
+        return f"SensorBlock({self.name!r}, rows={len(self)}, columns={self.columns})"
+
+    @property
+    def nbytes(self) -> int:
+        return self.times.nbytes + self.values.nbytes
+
+    def frame(self) -> pd.DataFrame:
+        """The readings as a DataFrame indexed by sim_time, one column per value."""
+        return pd.DataFrame(
+            self.values, columns=self.columns, index=pd.Index(self.times, name="sim_time"), copy=False
+        )
+
+
+class SensorFrames:
+    """
+    A non-CSV sensor's frames (lidar point clouds, depth images) memory-mapped from the
+    <name>.npy / <name>_sim_time.npy pair transfer.py exports: values is a read-only
+    (n_frames, *shape) float32 array and times its float64 sim_time. Slicing and
+    between() return views, so only the frames actually used are read from disk.
+    """
+
+    def __init__(self, name: str, kind: Optional[str], times: np.ndarray, values: np.ndarray) -> None:
+        self.name = name
+        self.kind = kind
+        self.times = times
+        self.values = values
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    def __getitem__(self, key) -> np.ndarray:
+        return self.values[key]
+
+    def __repr__(self) -> str:
+        return f"SensorFrames({self.name!r}, frames={len(self)}, shape={self.values.shape[1:]})"
+
+    @property
+    def shape(self) -> tuple:
+        return self.values.shape
+
+    def between(self, t0: float, t1: float) -> "SensorFrames":
+        """The frames with t0 <= sim_time <= t1, as views."""
+        lo = int(np.searchsorted(self.times, t0, side="left"))
+        hi = int(np.searchsorted(self.times, t1, side="right"))
+        return SensorFrames(self.name, self.kind, self.times[lo:hi], self.values[lo:hi])
+
+    def at(self, t: float) -> Tuple[float, np.ndarray]:
+        """
+        The latest frame at or before sim_time t, as (sim_time, frame view).
+
+        Raises:
+            IndexError: If every frame is later than t.
+        """
+        i = int(np.searchsorted(self.times, t, side="right")) - 1
+        if i < 0:
+            raise IndexError(f"No {self.name} frame at or before {t} s")
+        return float(self.times[i]), self.values[i]
+
+    def batches(self, batch_frames: int = 64) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """Yield (sim_time, frames) views of up to batch_frames consecutive frames."""
+        for start in range(0, len(self), batch_frames):
+            yield self.times[start:start + batch_frames], self.values[start:start + batch_frames]
+
+
+class SensorDataset(Mapping):
+    """
+    Read-only mapping of sensor name -> SensorBlock, in sensors.json order.
+
+    Each sensor keeps its own dense block, so memory scales with the readings actually
+    recorded and columns of different sensors (gyro x, accelerometer x) never share a
+    column. to_long() builds the sparse wide frame access.data() returns on demand.
+
+    Non-CSV sensors are kept apart in self.frames as memory-mapped SensorFrames, so
+    lidar and depth sit next to the low-dimensional readings without being loaded.
+
+    Args:
+        blocks (dict): Loaded SensorBlocks by sensor name.
+        schema (dict): csv_columns of every CSV-capable sensor in sensors.json, by name,
+            used to lay out to_long() whichever sensors were loaded.
+        frames (dict, optional): SensorFrames by sensor name.
+    """
+
+    def __init__(
+        self, blocks: Dict[str, SensorBlock], schema: Dict[str, list], frames: Optional[Dict[str, SensorFrames]] = None
+    ) -> None:
+        self.schema = dict(schema)
+        self._blocks = {name: blocks[name] for name in self.schema if name in blocks}
+        self.frames = dict(frames or {})
+
+    def __getitem__(self, name: str) -> SensorBlock:
+        return self._blocks[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._blocks)
+
+    def __len__(self) -> int:
+        return len(self._blocks)
+
+    def __repr__(self) -> str:
+        loaded = [f"{name}={len(b)}" for name, b in self._blocks.items()]
+        loaded += [f"{name}={len(f)} frames" for name, f in self.frames.items()]
+        return f"SensorDataset({', '.join(loaded)})"
+
+    @property
+    def nbytes(self) -> int:
+        return sum(block.nbytes for block in self._blocks.values())
+
+    def unified_columns(self) -> list:
+        """Union of all sensors' columns, in order of first appearance in sensors.json."""
+        return list(dict.fromkeys(col for columns in self.schema.values() for col in columns))
+
+    def to_long(self) -> pd.DataFrame:
+        """
+        The sparse wide long format: one row per reading with sim_time, the union of
+        all sensors' columns (NaN where a sensor has no such column) and a categorical
+        sensor column. Built with one allocation per column, not a concat of frames.
+        """
+        columns = self.unified_columns()
+        total = sum(len(block) for block in self._blocks.values())
+        sim_time = np.empty(total, dtype=np.float64)
+        unified = {col: np.full(total, np.nan, dtype=np.float32) for col in columns}
+        codes = np.empty(total, dtype=np.int8)
+        categories = list(self.schema)
+        row = 0
+        for name, block in self._blocks.items():
+            n = len(block)
+            sim_time[row:row + n] = block.times
+            for i, col in enumerate(block.columns):
+                unified[col][row:row + n] = block.values[:, i]
+            codes[row:row + n] = categories.index(name)
+            row += n
+        df = pd.DataFrame({"sim_time": sim_time, **unified}, copy=False)
+        df["sensor"] = pd.Categorical.from_codes(codes, dtype=pd.CategoricalDtype(categories))
+        return df
+
+
+# Rows between entries of a CSV's time index, see csv_time_index()
+TIME_INDEX_STRIDE = 64
+
+# Parsed time indexes by absolute CSV path, validated against the CSV's stat like the stored copy
+_TIME_INDEXES: Dict[str, dict] = {}
+# Subfolder of frame_cache.CACHE_DIR holding the CSV time indexes
+TIME_INDEX_DIR = "time_index"
+
+
+def time_index_path(csv_path: str) -> str:
+    """
+    Path of a sensor CSV's stored time index: frame_cache.CACHE_DIR/time_index/<hash of the CSV's
+    absolute path>.json. Session folders are never written to.
+    """
+    digest = hashlib.sha256(os.path.abspath(csv_path).encode()).hexdigest()[:32]
+    return os.path.join(frame_cache.CACHE_DIR, TIME_INDEX_DIR, f"{digest}.json")
+
+
+def _build_time_index(csv_path: str, stride: int) -> dict:
+    with open(csv_path, "rb") as f:
+        raw = f.read()
+    buf = np.frombuffer(raw, dtype=np.uint8)
+    # Row starts are the bytes after each newline; the first newline ends the header
+    starts = np.flatnonzero(buf == ord("\n")) + 1
+    starts = starts[starts < len(raw)]
+    offsets = starts[::stride]
+    times = [float(raw[o:raw.index(b",", o)]) for o in offsets]
+    t_last = float(raw[starts[-1]:raw.index(b",", starts[-1])]) if len(starts) else None
+    return {"rows": len(starts), "stride": stride, "offsets": offsets.tolist(), "times": times, "t_last": t_last}
+
+
+def csv_time_index(csv_path: str, stride: int = TIME_INDEX_STRIDE) -> dict:
+    """
+    Time index of a sensor CSV: the byte offset and sim_time of every stride-th row.
+
+    sim_time is monotonic in the recordings, so a time range maps to a contiguous byte
+    range of the file. The index is built with one pass over the file, kept in memory
+    and, when the cache is enabled, stored under frame_cache.CACHE_DIR (see time_index_path()). It
+    is used for as long as the CSV's path, size and mtime are unchanged.
+
+    Returns:
+        dict: rows, stride, offsets (byte offset of rows 0, stride, 2 * stride, ...),
+        times (their sim_time) and t_last (sim_time of the last row).
+    """
+    key = os.path.abspath(csv_path)
+    stat = _stat_key(csv_path)
+    # Chunked reads (iter_dataset()) look the index up once per read; keep it parsed
+    index = _TIME_INDEXES.get(key)
+    if index is not None and index["stat"] == stat and index["stride"] == stride:
+        return index
+    index_path = time_index_path(csv_path)
+    if frame_cache.CACHE_ENABLED:
+        try:
+            with open(index_path) as f:
+                index = json.load(f)
+            if index["path"] == key and index["stat"] == stat and index["stride"] == stride:
+                _TIME_INDEXES[key] = index
+                return index
+        except (OSError, ValueError, KeyError):
+            pass
+
+    index = _build_time_index(csv_path, stride)
+    index["path"] = key
+    index["stat"] = stat
+    _TIME_INDEXES[key] = index
+    if frame_cache.CACHE_ENABLED:
+        tmp = f"{index_path}.tmp-{os.getpid()}-{threading.get_ident()}"
+        try:
+            os.makedirs(os.path.dirname(index_path), exist_ok=True)
+            with open(tmp, "w") as f:
+                json.dump(index, f)
+            os.replace(tmp, index_path)
+        except OSError as e:
+            # Still usable, the index is just rebuilt in the next process
+            logger.warning(f"Could not store time index {index_path}: {e}")
+    return index
+
+
+# How sample_fraction selects readings, see dataset()
+SAMPLING_MODES = ("blocks", "rows")
+DEFAULT_BLOCK_DURATION = 5.0
+
+
+def _range_mask(times: np.ndarray, ranges: list) -> np.ndarray:
+    """Rows of sorted times within any of the sorted closed (t0, t1) ranges."""
+    keep = np.zeros(len(times), dtype=bool)
+    for t0, t1 in ranges:
+        keep[np.searchsorted(times, t0, side="left"):np.searchsorted(times, t1, side="right")] = True
+    return keep
+
+
+def _read_csv_rows(
+    csv_path: str,
+    s: dict,
+    usecols: list,
+    ranges: Optional[list],
+    row_fraction: Optional[float],
+    rng: Optional[np.random.Generator],
+) -> pd.DataFrame:
+    """
+    Read a sensor CSV's columns. With ranges, only the byte ranges of the rows around
+    them are read; with row_fraction, a uniform sample of those rows is parsed and the
+    other lines skipped.
+    """
+    schema = csv_schema(s)
+    if ranges is None and row_fraction is None:
+        return pd.read_csv(csv_path, dtype=schema, usecols=usecols, engine=CSV_ENGINE)
+
+    index = csv_time_index(csv_path)
+    times = np.asarray(index["times"], dtype=np.float64)
+    offsets, stride, rows = index["offsets"], index["stride"], index["rows"]
+    # Spans of `stride`-row index blocks: from the one that may hold t0 to the last starting at or before t1
+    spans = []
+    for t0, t1 in ranges if ranges is not None else [(-np.inf, np.inf)]:
+        first = max(int(np.searchsorted(times, t0, side="left")) - 1, 0)
+        last = int(np.searchsorted(times, t1, side="right"))
+        if spans and first <= spans[-1][1]:
+            spans[-1][1] = max(spans[-1][1], last)
+        elif last > first:
+            spans.append([first, last])
+
+    with open(csv_path, "rb") as f:
+        header = f.readline()
+        parts = [header]
+        for first, last in spans:
+            f.seek(offsets[first])
+            parts.append(f.read(offsets[last] - offsets[first]) if last < len(offsets) else f.read())
+
+    skiprows = None
+    if row_fraction is not None:
+        candidates = sum(min(last * stride, rows) - first * stride for first, last in spans)
+        keep = rng.choice(candidates, size=int(round(row_fraction * candidates)), replace=False)
+        # Line 0 of the buffer is the header
+        skiprows = np.setdiff1d(np.arange(candidates), keep) + 1
+    # pyarrow only takes an integer skiprows, so row samples are parsed by the C parser
+    engine = CSV_ENGINE if skiprows is None else "c"
+    return pd.read_csv(
+        io.BytesIO(b"".join(parts)), dtype=schema, usecols=usecols, skiprows=skiprows, engine=engine
+    )
+
+
+def _read_sensor(
+    folder: str,
+    s: dict,
+    columns: Optional[list] = None,
+    ranges: Optional[list] = None,
+    row_fraction: Optional[float] = None,
+    rng: Optional[np.random.Generator] = None,
+) -> Tuple[np.ndarray, np.ndarray, str]:
+    """
+    Read a sensor's file into (float64 sim_time, float32 values (n, n_columns), path read),
+    preferring the typed <name>.npy / <name>_sim_time.npy columns written by transfer.py.
+
+    Only the given csv_columns (default all) are read, and only the readings within the
+    sorted closed (t0, t1) ranges when given: typed columns are memory-mapped and sliced,
+    CSVs read through their time index (see csv_time_index()). With row_fraction, a
+    uniform sample of those readings drawn from rng is read.
+    """
+    sensor_name = s["name"]
+    all_columns = s["csv_columns"]
+    columns = all_columns if columns is None else columns
+    positions = [all_columns.index(col) for col in columns]
+    values_path = os.path.join(folder, f"{sensor_name}.npy")
+    times_path = os.path.join(folder, f"{sensor_name}_sim_time.npy")
+    if os.path.exists(values_path) and os.path.exists(times_path):
+        logger.info(f"Loading data from {values_path}")
+        selected = ranges is not None or row_fraction is not None
+        mmap_mode = None if not selected and columns == all_columns else "r"
+        times = np.load(times_path, mmap_mode=mmap_mode)
+        values = np.load(values_path, mmap_mode=mmap_mode)
+        values = values.reshape(len(values), -1)
+        rows = slice(None)
+        if selected:
+            if ranges is not None:
+                # Only the selected rows are indexed, so a short range costs no full-length array
+                rows = np.concatenate([
+                    np.arange(np.searchsorted(times, t0, side="left"), np.searchsorted(times, t1, side="right"))
+                    for t0, t1 in ranges
+                ] or [np.arange(0)])
+            else:
+                rows = np.arange(len(times))
+            if row_fraction is not None:
+                rows = rows[np.sort(rng.choice(len(rows), size=int(round(row_fraction * len(rows))), replace=False))]
+        if columns != all_columns:
+            values = values[rows][:, positions]
+        else:
+            values = values[rows]
+        return np.array(times[rows], dtype=np.float64), np.array(values, dtype=np.float32), values_path
+
+    file_path = os.path.join(folder, f"{sensor_name}.csv")
+    logger.info(f"Loading data from {file_path}")
+    with open(file_path) as f:
+        header = f.readline().strip().split(",")
+    # Single-value sensors are written as `value`, others as value_0, value_1, ...
+    value_columns = ["value"] if "value" in header else [f"value_{i}" for i in positions]
+    df = _read_csv_rows(file_path, s, ["sim_time", *value_columns], ranges, row_fraction, rng)
+    times = df["sim_time"].to_numpy(dtype=np.float64)
+    values = df[value_columns].to_numpy(dtype=np.float32)
+    if ranges is not None:
+        keep = _range_mask(times, ranges)
+        times, values = times[keep], values[keep]
+    return times, values, file_path
+
+
+def _time_span(folder: str, s: dict) -> Optional[Tuple[float, float]]:
+    """First and last sim_time of a sensor's file from its index, or None if it has no readings."""
+    times_path = os.path.join(folder, f"{s['name']}_sim_time.npy")
+    if os.path.exists(times_path) and os.path.exists(os.path.join(folder, f"{s['name']}.npy")):
+        times = np.load(times_path, mmap_mode="r")
+        return (float(times[0]), float(times[-1])) if len(times) else None
+    index = csv_time_index(os.path.join(folder, f"{s['name']}.csv"))
+    return (index["times"][0], index["t_last"]) if index["rows"] else None
+
+
+def sample_blocks(
+    t_first: float,
+    t_last: float,
+    fraction: float,
+    block_duration: float,
+    seed: int,
+    time_range: Optional[Tuple[float, float]] = None,
+) -> list:
+    """
+    Seeded choice of round(fraction * n) of the n block_duration-long sim_time blocks
+    covering [t_first, t_last] (at least one for a positive fraction), clipped to
+    time_range. Blocks sit on a grid of multiples of block_duration, so the choice only
+    depends on the seed and the span.
+
+    Returns:
+        list: Sorted, non-overlapping closed (t0, t1) ranges, adjacent blocks merged.
+    """
+    if time_range is not None:
+        t_first, t_last = max(t_first, time_range[0]), min(t_last, time_range[1])
+    if t_last < t_first:
+        return []
+    first = int(np.floor(t_first / block_duration))
+    n = int(np.floor(t_last / block_duration)) - first + 1
+    k = int(round(fraction * n))
+    if fraction > 0:
+        k = max(k, 1)
+    chosen = np.sort(np.random.default_rng(seed).choice(n, size=k, replace=False)) + first
+    ranges = []
+    for block in chosen.tolist():
+        t0 = block * block_duration
+        # Closed ranges: a block ends just before the next one starts
+        t1 = float(np.nextafter((block + 1) * block_duration, -np.inf))
+        if ranges and block == ranges[-1][2] + 1:
+            ranges[-1][1], ranges[-1][2] = t1, block
+        else:
+            ranges.append([t0, t1, block])
+    ranges = [(t0, t1) for t0, t1, _ in ranges]
+    if time_range is not None:
+        ranges = [(max(t0, time_range[0]), min(t1, time_range[1])) for t0, t1 in ranges]
+    return ranges
+
+
+def sample_rng(seed: int, sensor_name: str) -> np.random.Generator:
+    """Random generator for sampling one sensor's rows, independent of sensor_rng()."""
+    return np.random.default_rng([seed, zlib.crc32(sensor_name.encode()), 1])
+
+
+def _load_sensor(
+    folder: str,
+    s: dict,
+    columns: list,
+    ranges: Optional[list],
+    row_fraction: Optional[float],
+    degradation: Optional[dict],
+    seed: int,
+    t_origin: Optional[float] = None,
+) -> Optional[SensorBlock]:
+    """
+    Load one sensor's readings as a SensorBlock, or None if it cannot be read.
+    t_origin is passed on to degrade_arrays().
+    """
+    sensor_name = s["name"]
+    file_path = os.path.join(folder, f"{sensor_name}.csv")
+    try:
+        times, values, file_path = _read_sensor(
+            folder, s, columns, ranges, row_fraction, sample_rng(seed, sensor_name)
+        )
+
+        if len(times) == 0 and (ranges is not None or row_fraction is not None):
+            logger.info(f"No readings selected from {file_path}")
+            return None
+        if len(times) == 0:
+            logger.warning(f"Loaded file is empty: {file_path}")
+            print(f"Warning: The file {file_path} is empty.")
+            return None
+
+        # Degrade the readings read, i.e. after sampling and time selection
+        if degradation:
+            original_rows = len(times)
+            times, values = degrade_arrays(
+                times, values, sensor_profile(degradation, sensor_name), sensor_rng(seed, sensor_name), t_origin
+            )
+            values = values.astype(np.float32)
+            logger.info(f"Degraded {sensor_name}: {len(times)} of {original_rows} rows kept")
+
+        block = SensorBlock(sensor_name, columns, np.ascontiguousarray(times), np.ascontiguousarray(values))
+        logger.info(f"Successfully loaded data for {sensor_name}: {len(block)} rows, {len(block.columns)} columns")
+        return block
+
+    except FileNotFoundError:
+        logger.error(f"Data file not found: {file_path}")
+        print(f"Error: Could not find file -> {file_path}")
+    except PermissionError:
+        logger.error(f"Permission denied when accessing: {file_path}")
+        print(f"Error: Permission denied -> {file_path}")
+    except Exception as e:
+        logger.error(f"Unexpected error loading data: {e}")
+        print(f"Error loading data from {file_path}: {e}")
+    return None
+
+
+def load_sensor_config() -> Optional[list]:
+    """
+    Load sensors.json from robot/controllers/drive_robot/sensors.json, or None on error.
+    """
+    sensors_file = os.path.join("robot", "controllers", "drive_robot", "sensors.json")
+    try:
+        with open(sensors_file, 'r') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        logger.error(f"Sensors configuration file not found: {sensors_file}")
+        print(f"Error: Could not find sensors.json -> {sensors_file}")
+    except json.JSONDecodeError as e:
+        logger.error(f"Error parsing sensors.json: {e}")
+        print(f"Error parsing sensors.json: {e}")
+    except Exception as e:
+        logger.error(f"Unexpected error loading sensors.json: {e}")
+        print(f"Error loading sensors.json: {e}")
+    return None
+
+
+def frames(folder: str, sensor: str, time_range: Optional[Tuple[float, float]] = None) -> Optional[SensorFrames]:
+    """
+    Memory-map a non-CSV sensor's frames (e.g. "lidar", "depth") from a session folder
+    converted by transfer.py, without reading them into RAM.
+
+    Args:
+        folder (str): Session folder holding <sensor>.npy and <sensor>_sim_time.npy.
+        sensor (str): Sensor name from sensors.json.
+        time_range (tuple, optional): (t0, t1) to keep only frames with t0 <= sim_time <= t1.
+
+    Returns:
+        SensorFrames or None: The (n_frames, *shape) frames, or None on error.
+    """
+    sensors_config = load_sensor_config()
+    if sensors_config is None:
+        return None
+    s = next((s for s in sensors_config if s["name"] == sensor), None)
+    if s is None:
+        logger.error(f"Unknown sensor: {sensor}")
+        print(f"Error: Unknown sensor -> {sensor}")
+        return None
+    return _load_frames(folder, s, time_range)
+
+
+def _load_frames(folder: str, s: dict, time_range: Optional[Tuple[float, float]]) -> Optional[SensorFrames]:
+    values_path = os.path.join(folder, f"{s['name']}.npy")
+    times_path = os.path.join(folder, f"{s['name']}_sim_time.npy")
+    try:
+        times = np.load(times_path, mmap_mode="r")
+        values = np.load(values_path, mmap_mode="r") if len(times) else np.empty((0, *s["shape"]), np.float32)
+    except FileNotFoundError:
+        logger.error(f"Frame files not found: {values_path} (convert the session with transfer.py)")
+        print(f"Error: Could not find file -> {values_path}")
+        return None
+    except Exception as e:
+        logger.error(f"Unexpected error mapping frames: {e}")
+        print(f"Error loading frames from {values_path}: {e}")
+        return None
+    if len(values) != len(times) or tuple(values.shape[1:]) != tuple(s["shape"]):
+        logger.error(f"{values_path} holds {values.shape}, expected ({len(times)}, *{s['shape']})")
+        print(f"Error: Unexpected frame shape in {values_path} -> {values.shape}")
+        return None
+    loaded = SensorFrames(s["name"], s.get("kind"), times, values)
+    if time_range is not None:
+        loaded = loaded.between(*time_range)
+    logger.info(f"Mapped {len(loaded)} {s['name']} frames of shape {tuple(s['shape'])} from {values_path}")
+    return loaded
+
+
+def select_columns(csv_sensors: list, sensors: Optional[list], columns: Optional[list]) -> Optional[dict]:
+    """
+    The csv_columns to read per sensor for a sensors= / columns= selection, in
+    sensors.json order. Sensors without any requested column are not read at all.
+    Returns None, after reporting, if a name is not a CSV-capable sensor or column.
+    """
+    schema = {s["name"]: s["csv_columns"] for s in csv_sensors}
+    if sensors is not None:
+        unknown = [name for name in sensors if name not in schema]
+        if unknown:
+            logger.error(f"Unknown sensors: {unknown}")
+            print(f"Error: Unknown sensors -> {unknown}")
+            return None
+        schema = {name: cols for name, cols in schema.items() if name in sensors}
+    if columns is not None:
+        known = {col for cols in schema.values() for col in cols}
+        unknown = [col for col in columns if col not in known]
+        if unknown:
+            logger.error(f"Unknown columns for the selected sensors: {unknown}")
+            print(f"Error: Unknown columns -> {unknown}")
+            return None
+        schema = {name: [col for col in cols if col in columns] for name, cols in schema.items()}
+        schema = {name: cols for name, cols in schema.items() if cols}
+    return schema
+
+
+def _time_spans(folder: str, csv_sensors: list) -> dict:
+    """_time_span() of each sensor by name; sensors whose file cannot be read are left out."""
+    spans = {}
+    for s in csv_sensors:
+        try:
+            spans[s["name"]] = _time_span(folder, s)
+        except (OSError, ValueError):
+            # Reported when the sensor itself is loaded
+            continue
+    return spans
+
+
+def _read_plan(
+    folder: str,
+    sample_fraction: float,
+    degradation: Optional[dict],
+    seed: int,
+    sensors: Optional[list],
+    columns: Optional[list],
+    time_range: Optional[Tuple[float, float]],
+    sampling: str,
+    block_duration: float,
+) -> Optional[dict]:
+    """
+    Validate dataset() arguments and work out what to read: the per-sensor columns
+    (schema), the CSV-capable and frame sensors, and the sim_time ranges and row
+    fraction every sensor reads. Returns None, after reporting, on invalid arguments.
+    """
+    # Validate sample_fraction
+    if not 0.0 <= sample_fraction <= 1.0:
+        logger.error(f"Invalid sample_fraction: {sample_fraction}. Must be between 0.0 and 1.0.")
+        print(f"Error: Invalid sample_fraction -> {sample_fraction}. Must be between 0.0 and 1.0.")
+        return None
+    if sampling not in SAMPLING_MODES or not block_duration > 0:
+        logger.error(f"Invalid sampling: {sampling!r} with block_duration {block_duration}")
+        print(f"Error: Invalid sampling -> {sampling!r} (one of {SAMPLING_MODES}, block_duration > 0)")
+        return None
+
+    # Validate the degradation profile
+    if degradation:
+        unknown = [key for key in _profile_keys(degradation) if key not in DEGRADATION_PARAMS]
+        if unknown:
+            logger.error(f"Unknown degradation parameters: {unknown}")
+            print(f"Error: Unknown degradation parameters -> {unknown}")
+            return None
+
+    # Ensure folder exists
+    if not os.path.exists(folder):
+        logger.error(f"Folder not found: {folder}")
+        print(f"Error: Folder not found -> {folder}")
+        return None
+
+    sensors_config = load_sensor_config()
+    if sensors_config is None:
+        return None
+
+    # Sensors that can be converted to CSV, and the columns wanted from each. Frame sensors
+    # are memory-mapped when named in sensors, or when present if no selection is given
+    csv_sensors = [s for s in sensors_config if s.get("can_csv", False)]
+    frame_sensors = [s for s in sensors_config if not s.get("can_csv", False)]
+    frame_names = {s["name"] for s in frame_sensors}
+    csv_names = None if sensors is None else [name for name in sensors if name not in frame_names]
+    schema = select_columns(csv_sensors, csv_names, columns)
+    if schema is None:
+        return None
+    if sensors is not None:
+        frame_sensors = [s for s in frame_sensors if s["name"] in sensors]
+    elif columns is not None:
+        frame_sensors = []
+    else:
+        frame_sensors = [s for s in frame_sensors if os.path.exists(os.path.join(folder, f"{s['name']}.npy"))]
+    if time_range is not None:
+        time_range = (float(time_range[0]), float(time_range[1]))
+    selected = [s for s in csv_sensors if s["name"] in schema]
+
+    # Turn the time range and block sampling into the sim_time ranges every sensor reads
+    ranges = None if time_range is None else [time_range]
+    row_fraction = None
+    if sample_fraction < 1.0 and sampling == "rows":
+        row_fraction = sample_fraction
+    elif sample_fraction < 1.0:
+        spans = [span for span in _time_spans(folder, selected).values() if span is not None]
+        if spans:
+            ranges = sample_blocks(
+                min(t0 for t0, _ in spans), max(t1 for _, t1 in spans),
+                sample_fraction, block_duration, seed, time_range,
+            )
+            logger.info(f"Sampled {len(ranges)} time ranges of {block_duration} s blocks (fraction: {sample_fraction})")
+
+    return {
+        "schema": schema, "csv_sensors": selected, "frame_sensors": frame_sensors,
+        "ranges": ranges, "row_fraction": row_fraction, "time_range": time_range,
+    }
+
+
+def dataset(
+    folder: str = "data",
+    sample_fraction: float = 1.0,
+    degradation: Optional[dict] = None,
+    seed: int = 0,
+    workers: Optional[int] = None,
+    sensors: Optional[list] = None,
+    columns: Optional[list] = None,
+    time_range: Optional[Tuple[float, float]] = None,
+    sampling: str = "blocks",
+    block_duration: float = DEFAULT_BLOCK_DURATION,
+) -> Optional[SensorDataset]:
+    """
+    Read a session folder into a SensorDataset of dense per-sensor blocks.
+
+    Takes the same arguments as access.data(), which is dataset(...).to_long(). Use it when
+    per-sensor arrays are wanted: dataset(folder)["gyro"].values is a contiguous
+    float32 (n, 3) array and dataset(folder)["gyro"].frame() a sim_time-indexed frame.
+    Non-CSV sensors (lidar, depth) converted by transfer.py are memory-mapped into
+    .frames, e.g. dataset(folder).frames["lidar"].between(t0, t1); sensors= may name
+    them, and time_range applies to them too (sampling does not).
+
+    Returns:
+        SensorDataset or None: The loaded sensors, or None on error.
+    """
+    logger.info(f"Starting data access operation in folder: {folder}")
+    plan = _read_plan(
+        folder, sample_fraction, degradation, seed, sensors, columns, time_range, sampling, block_duration
+    )
+    if plan is None:
+        return None
+    schema, selected, frame_sensors = plan["schema"], plan["csv_sensors"], plan["frame_sensors"]
+    ranges, row_fraction, time_range = plan["ranges"], plan["row_fraction"], plan["time_range"]
+
+    # Read the sensor files concurrently (the file readers release the GIL)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        loaded = pool.map(
+            lambda s: _load_sensor(folder, s, schema[s["name"]], ranges, row_fraction, degradation, seed),
+            selected,
+        )
+        blocks = {block.name: block for block in loaded if block is not None}
+
+    mapped = {}
+    for s in frame_sensors:
+        loaded_frames = _load_frames(folder, s, time_range)
+        if loaded_frames is not None:
+            mapped[s["name"]] = loaded_frames
+
+    if not blocks and not mapped:
+        logger.error("No valid data loaded from any sensor")
+        print("Error: No valid data loaded from any sensor")
+        return None
+
+    return SensorDataset(blocks, schema, mapped)
+
+
+def sampled_ranges(
+    folder: str = "data",
+    sample_fraction: float = 1.0,
+    seed: int = 0,
+    sensors: Optional[list] = None,
+    columns: Optional[list] = None,
+    time_range: Optional[Tuple[float, float]] = None,
+    sampling: str = "blocks",
+    block_duration: float = DEFAULT_BLOCK_DURATION,
+) -> Optional[list]:
+    """
+    The sorted closed (t0, t1) sim_time ranges dataset() reads for these arguments, e.g.
+    the blocks kept by block sampling. None when whole files are read, or on error.
+    """
+    plan = _read_plan(folder, sample_fraction, None, seed, sensors, columns, time_range, sampling, block_duration)
+    return None if plan is None else plan["ranges"]
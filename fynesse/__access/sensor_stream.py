@@ -0,0 +1,195 @@
+"""
+Streaming a session in time-ordered sim_time chunks with bounded memory, for sessions
+too long to load at once. iter_data() is the out-of-core counterpart of access.data().
+"""
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from sensor_reader import (
+    DEFAULT_BLOCK_DURATION, SensorBlock, SensorDataset, _load_frames, _load_sensor, _read_plan, _time_spans,
+)
+
+logger = logging.getLogger(__name__)
+
+
+# Default length of the sim_time chunks iter_dataset() and iter_data() yield, in seconds,
+# and the sim_time read at once when chunks are shorter (each CSV read has a fixed cost)
+DEFAULT_CHUNK_DURATION = 10.0
+CHUNK_READ_AHEAD = 300.0
+
+
+def chunk_ranges(
+    t_first: float, t_last: float, chunk_duration: float, time_range: Optional[Tuple[float, float]] = None
+) -> list:
+    """
+    Closed (t0, t1) sim_time chunks covering [t_first, t_last], clipped to time_range.
+    Like sample_blocks(), chunks sit on a grid of multiples of chunk_duration and end
+    just before the next one starts, so every reading falls in exactly one chunk.
+    """
+    if time_range is not None:
+        t_first, t_last = max(t_first, time_range[0]), min(t_last, time_range[1])
+    if t_last < t_first:
+        return []
+    chunks = []
+    for k in range(int(np.floor(t_first / chunk_duration)), int(np.floor(t_last / chunk_duration)) + 1):
+        t0 = k * chunk_duration
+        t1 = float(np.nextafter((k + 1) * chunk_duration, -np.inf))
+        if time_range is not None:
+            t0, t1 = max(t0, time_range[0]), min(t1, time_range[1])
+        chunks.append((t0, t1))
+    return chunks
+
+
+def _clip_ranges(ranges: list, t0: float, t1: float) -> list:
+    """The parts of sorted closed ranges within [t0, t1]."""
+    return [(max(a, t0), min(b, t1)) for a, b in ranges if a <= t1 and b >= t0]
+
+
+def _chunk_seed(seed: int, t0: float, chunk_duration: float) -> int:
+    """Seed for one read's row sampling and degradation, fixed by its place on the chunk grid."""
+    chunk = int(np.floor(t0 / chunk_duration))
+    return int(np.random.SeedSequence([seed & 0xFFFFFFFF, chunk & 0xFFFFFFFF]).generate_state(1)[0])
+
+
+def iter_dataset(
+    folder: str = "data",
+    chunk_duration: float = DEFAULT_CHUNK_DURATION,
+    sample_fraction: float = 1.0,
+    degradation: Optional[dict] = None,
+    seed: int = 0,
+    workers: Optional[int] = None,
+    sensors: Optional[list] = None,
+    columns: Optional[list] = None,
+    time_range: Optional[Tuple[float, float]] = None,
+    sampling: str = "blocks",
+    block_duration: float = DEFAULT_BLOCK_DURATION,
+) -> Iterator[SensorDataset]:
+    """
+    Stream a session as SensorDatasets of consecutive chunk_duration-long sim_time
+    chunks (see chunk_ranges()), in time order and without overlap. Readings are read
+    with the time-range pushdown of dataset(), CHUNK_READ_AHEAD seconds at a time when
+    chunks are shorter, and the next read runs while the current chunks are consumed,
+    so memory is bounded by the chunk duration, not the session length. Chunks without
+    readings (e.g. blocks left out by sampling) are skipped.
+
+    Takes the same arguments as dataset(). Block sampling picks the same blocks as
+    dataset(); row sampling and degradation draw per read, reproducibly for a given
+    seed and chunk_duration, with drift growing from each sensor's first recorded
+    reading. Frame sensors are mapped once and each chunk holds views of its frames
+    in .frames.
+
+    Yields:
+        SensorDataset: One chunk, with the same schema whichever sensors it holds.
+    """
+    if not chunk_duration > 0:
+        logger.error(f"Invalid chunk_duration: {chunk_duration}")
+        print(f"Error: Invalid chunk_duration -> {chunk_duration}. Must be positive.")
+        return
+    logger.info(f"Streaming {folder} in {chunk_duration} s chunks")
+    plan = _read_plan(
+        folder, sample_fraction, degradation, seed, sensors, columns, time_range, sampling, block_duration
+    )
+    if plan is None:
+        return
+    schema, ranges, row_fraction = plan["schema"], plan["ranges"], plan["row_fraction"]
+
+    # Read each sensor's span from its index once, reporting unreadable files up front
+    spans = _time_spans(folder, plan["csv_sensors"])
+    readable = []
+    for s in plan["csv_sensors"]:
+        if s["name"] not in spans:
+            logger.error(f"Could not read {s['name']} in {folder}")
+            print(f"Error: Could not read sensor -> {s['name']}")
+        elif spans[s["name"]] is None:
+            logger.warning(f"No readings for {s['name']} in {folder}")
+        else:
+            readable.append(s)
+    mapped = {}
+    for s in plan["frame_sensors"]:
+        loaded_frames = _load_frames(folder, s, plan["time_range"])
+        if loaded_frames is not None:
+            mapped[s["name"]] = loaded_frames
+
+    bounds = [spans[s["name"]] for s in readable]
+    bounds += [(float(f.times[0]), float(f.times[-1])) for f in mapped.values() if len(f)]
+    if not bounds:
+        logger.error("No valid data loaded from any sensor")
+        print("Error: No valid data loaded from any sensor")
+        return
+
+    # Short chunks are read several at a time, on a grid of whole chunks, and split in memory
+    per_read = max(1, int(CHUNK_READ_AHEAD // chunk_duration))
+    reads = chunk_ranges(
+        min(t0 for t0, _ in bounds), max(t1 for _, t1 in bounds), chunk_duration * per_read, plan["time_range"]
+    )
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        def submit(read):
+            t0, t1 = read
+            selected = [read] if ranges is None else _clip_ranges(ranges, t0, t1)
+            if not selected:
+                return []
+            read_seed = _chunk_seed(seed, t0, chunk_duration * per_read)
+            return [
+                pool.submit(
+                    _load_sensor, folder, s, schema[s["name"]], selected, row_fraction, degradation,
+                    read_seed, spans[s["name"]][0],
+                )
+                for s in readable
+            ]
+
+        pending = submit(reads[0]) if reads else []
+        for i, read in enumerate(reads):
+            futures = pending
+            pending = submit(reads[i + 1]) if i + 1 < len(reads) else []
+            blocks = [block for block in (f.result() for f in futures) if block is not None]
+            for t0, t1 in chunk_ranges(read[0], read[1], chunk_duration, read):
+                chunk_blocks = {}
+                for block in blocks:
+                    lo = int(np.searchsorted(block.times, t0, side="left"))
+                    hi = int(np.searchsorted(block.times, t1, side="right"))
+                    if hi > lo:
+                        chunk_blocks[block.name] = SensorBlock(
+                            block.name, block.columns, block.times[lo:hi], block.values[lo:hi]
+                        )
+                chunk_frames = {name: f.between(t0, t1) for name, f in mapped.items()}
+                if not chunk_blocks and not any(len(f) for f in chunk_frames.values()):
+                    continue
+                yield SensorDataset(chunk_blocks, schema, chunk_frames)
+
+
+def iter_data(
+    folder: str = "data",
+    chunk_duration: float = DEFAULT_CHUNK_DURATION,
+    sample_fraction: float = 1.0,
+    degradation: Optional[dict] = None,
+    seed: int = 0,
+    workers: Optional[int] = None,
+    sensors: Optional[list] = None,
+    columns: Optional[list] = None,
+    time_range: Optional[Tuple[float, float]] = None,
+    sampling: str = "blocks",
+    block_duration: float = DEFAULT_BLOCK_DURATION,
+) -> Iterator[pd.DataFrame]:
+    """
+    Out-of-core counterpart of access.data(): yield the session in its long format as
+    consecutive chunk_duration-long sim_time chunks (see iter_dataset()). Every chunk
+    has the same columns and sensor categories, so chunks can be consumed one at a
+    time, e.g. by assess.stream_quality() or address.stream_statistics(), or
+    concatenated into the rows access.data() returns for the same arguments (without row
+    sampling or degradation, which draw per read).
+
+    Yields:
+        pd.DataFrame: One non-empty chunk in the sparse wide format with a sensor column.
+    """
+    for chunk in iter_dataset(
+        folder, chunk_duration, sample_fraction, degradation, seed, workers, sensors, columns, time_range,
+        sampling, block_duration,
+    ):
+        df = chunk.to_long()
+        if len(df):
+            yield df
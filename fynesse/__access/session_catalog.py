@@ -0,0 +1,289 @@
+"""
+The catalog of every session under a data root, and loading several sessions at once.
+"""
+import os
+import json
+import zlib
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from frame_cache import _stat_key
+from sensor_reader import DEFAULT_BLOCK_DURATION, _read_sensor, dataset, load_sensor_config
+
+logger = logging.getLogger(__name__)
+
+
+# Session folders under a data root, and the catalog file describing them
+SESSION_VARIANTS = ("noiseless", "noisy")
+CATALOG_NAME = "catalog.json"
+NOISE_PROFILE_NAME = "noise_profile.json"
+
+
+def _is_session(folder: str) -> bool:
+    return any(f.endswith((".csv", ".npy")) for f in os.listdir(folder))
+
+
+def find_sessions(root: str = "data") -> list:
+    """
+    Session folders under root, as keys relative to it: noiseless/<timestamp>,
+    noisy/<timestamp> and noisy/<profile>/<timestamp> (see transfer.py --grid).
+    """
+    keys = []
+    for variant in SESSION_VARIANTS:
+        variant_dir = os.path.join(root, variant)
+        if not os.path.isdir(variant_dir):
+            continue
+        for name in sorted(os.listdir(variant_dir)):
+            folder = os.path.join(variant_dir, name)
+            if not os.path.isdir(folder):
+                continue
+            if _is_session(folder):
+                keys.append(f"{variant}/{name}")
+            else:
+                keys.extend(
+                    f"{variant}/{name}/{sub}" for sub in sorted(os.listdir(folder))
+                    if os.path.isdir(os.path.join(folder, sub)) and _is_session(os.path.join(folder, sub))
+                )
+    return keys
+
+
+def _sensor_file(folder: str, s: dict) -> Optional[str]:
+    """The file _read_sensor() would read for a sensor, or None if it has none."""
+    for name in (f"{s['name']}.npy", f"{s['name']}.csv"):
+        if os.path.exists(os.path.join(folder, name)):
+            return name
+    return None
+
+
+def _finite(value: float) -> Optional[float]:
+    return float(value) if np.isfinite(value) else None
+
+
+def sensor_stats(folder: str, s: dict) -> dict:
+    """
+    Catalog entry for one sensor file: rows, sim_time span, rate and per-column min/max.
+    """
+    times, values, _ = _read_sensor(folder, s)
+    columns = s["csv_columns"]
+    stats = {"rows": len(times), "t_first": None, "t_last": None, "rate_hz": None,
+             "min": dict.fromkeys(columns), "max": dict.fromkeys(columns)}
+    if len(times):
+        stats["t_first"], stats["t_last"] = float(times[0]), float(times[-1])
+        if len(times) > 1 and times[-1] > times[0]:
+            stats["rate_hz"] = (len(times) - 1) / float(times[-1] - times[0])
+        with np.errstate(all="ignore"):
+            low, high = np.nanmin(values, axis=0), np.nanmax(values, axis=0)
+        stats["min"] = {col: _finite(v) for col, v in zip(columns, low)}
+        stats["max"] = {col: _finite(v) for col, v in zip(columns, high)}
+    return stats
+
+
+def _noise_profile(root: str, key: str) -> Tuple[Optional[str], Optional[dict]]:
+    """Noise profile name and parameters of a session, from its noise_profile.json."""
+    if not key.startswith("noisy/"):
+        return None, None
+    path = os.path.join(root, key, NOISE_PROFILE_NAME)
+    try:
+        with open(path) as f:
+            profile = json.load(f)
+        return profile.get("profile"), profile.get("noise_params")
+    except (OSError, ValueError):
+        # Noisy copies from before noise_profile.json: the default profile
+        return "default", None
+
+
+def _save_catalog(path: str, entries: dict) -> None:
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump({"sessions": entries}, f, indent=1)
+    os.replace(tmp, path)
+
+
+def catalog(root: str = "data", refresh: bool = False, workers: Optional[int] = None) -> Optional[pd.DataFrame]:
+    """
+    Catalog of every session under root/noiseless and root/noisy, one row per
+    (session, sensor), kept in root/catalog.json.
+
+    Each sensor file is read once to compute its statistics; later calls only stat the
+    files and recompute entries whose size or mtime changed, so selecting sessions
+    from the catalog does not open the recordings. Select with pandas and pass the
+    result to load_sessions(), e.g. every session where the robot touched something:
+
+        cat = access.catalog()
+        touched = cat[(cat["sensor"] == "touch") & (cat[["max_x", "max_y", "max_z"]].abs().max(axis=1) > 0)]
+        df = access.load_sessions(touched)
+
+    Args:
+        root (str, optional): Data root holding noiseless/ and noisy/. Defaults to "data".
+        refresh (bool, optional): Recompute every entry. Defaults to False.
+        workers (int, optional): Threads reading changed sensor files.
+
+    Returns:
+        pd.DataFrame or None: Columns session (key relative to root, e.g.
+        "noiseless/2025-09-22-155852"), variant, profile, noise_params, duration (of the
+        session, in seconds), sensor, rows, t_first, t_last, rate_hz and min_<column> /
+        max_<column> for every csv_columns entry in sensors.json. None on error.
+    """
+    if not os.path.isdir(root):
+        logger.error(f"Folder not found: {root}")
+        print(f"Error: Folder not found -> {root}")
+        return None
+
+    sensors_config = load_sensor_config()
+    if sensors_config is None:
+        return None
+    csv_sensors = [s for s in sensors_config if s.get("can_csv", False)]
+
+    path = os.path.join(root, CATALOG_NAME)
+    previous = {}
+    if not refresh and os.path.exists(path):
+        try:
+            with open(path) as f:
+                previous = json.load(f)["sessions"]
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Rebuilding unreadable catalog {path}: {e}")
+
+    # Work out which sensor files are new or changed since the catalog was written
+    entries, stale = {}, []
+    for key in find_sessions(root):
+        folder = os.path.join(root, key)
+        profile, noise_params = _noise_profile(root, key)
+        old_sensors = previous.get(key, {}).get("sensors", {})
+        sensors = {}
+        for s in csv_sensors:
+            file_name = _sensor_file(folder, s)
+            if file_name is None:
+                continue
+            stat = _stat_key(os.path.join(folder, file_name))
+            old = old_sensors.get(s["name"])
+            if old is not None and old["file"] == file_name and old["stat"] == stat:
+                sensors[s["name"]] = old
+            else:
+                sensors[s["name"]] = {"file": file_name, "stat": stat}
+                stale.append((key, s))
+        entries[key] = {"profile": profile, "noise_params": noise_params, "sensors": sensors}
+
+    if stale:
+        logger.info(f"Cataloging {len(stale)} new or changed sensor files under {root}")
+
+        def compute(item):
+            key, s = item
+            try:
+                return sensor_stats(os.path.join(root, key), s)
+            except Exception as e:
+                logger.error(f"Could not catalog {s['name']} in {key}: {e}")
+                return None
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for (key, s), stats in zip(stale, pool.map(compute, stale)):
+                if stats is None:
+                    del entries[key]["sensors"][s["name"]]
+                else:
+                    entries[key]["sensors"][s["name"]].update(stats)
+
+    if stale or set(entries) != set(previous):
+        try:
+            _save_catalog(path, entries)
+        except OSError as e:
+            logger.error(f"Could not write catalog {path}: {e}")
+
+    columns = list(dict.fromkeys(col for s in csv_sensors for col in s["csv_columns"]))
+    rows = []
+    for key, entry in entries.items():
+        firsts = [st["t_first"] for st in entry["sensors"].values() if st["t_first"] is not None]
+        lasts = [st["t_last"] for st in entry["sensors"].values() if st["t_last"] is not None]
+        duration = max(lasts) - min(firsts) if firsts else np.nan
+        for name, st in entry["sensors"].items():
+            row = {
+                "session": key, "variant": key.split("/")[0], "profile": entry["profile"],
+                "noise_params": entry["noise_params"], "duration": duration, "sensor": name,
+                "rows": st["rows"], "t_first": st["t_first"], "t_last": st["t_last"], "rate_hz": st["rate_hz"],
+            }
+            row.update({f"min_{col}": v for col, v in st["min"].items()})
+            row.update({f"max_{col}": v for col, v in st["max"].items()})
+            rows.append(row)
+
+    stat_columns = [f"{kind}_{col}" for col in columns for kind in ("min", "max")]
+    frame = pd.DataFrame(rows, columns=[
+        "session", "variant", "profile", "noise_params", "duration", "sensor",
+        "rows", "t_first", "t_last", "rate_hz", *stat_columns,
+    ])
+    float_columns = ["duration", "t_first", "t_last", "rate_hz", *stat_columns]
+    frame[float_columns] = frame[float_columns].astype(np.float64)
+    logger.info(f"Catalog of {root}: {len(entries)} sessions, {len(frame)} sensor files ({len(stale)} recomputed)")
+    return frame
+
+
+def session_seed(seed: int, session: str) -> int:
+    """Per-session degradation seed, so sessions loaded together get independent noise."""
+    return zlib.crc32(session.encode(), seed & 0xFFFFFFFF)
+
+
+def load_sessions(
+    sessions: Union[list, pd.DataFrame],
+    root: str = "data",
+    sample_fraction: float = 1.0,
+    degradation: Optional[dict] = None,
+    seed: int = 0,
+    workers: Optional[int] = None,
+    sensors: Optional[list] = None,
+    columns: Optional[list] = None,
+    time_range: Optional[Tuple[float, float]] = None,
+    sampling: str = "blocks",
+    block_duration: float = DEFAULT_BLOCK_DURATION,
+) -> Optional[pd.DataFrame]:
+    """
+    Load several sessions in parallel into one long-format frame partitioned by session.
+
+    Args:
+        sessions (list or pd.DataFrame): Session keys relative to root, e.g.
+            ["noiseless/2025-09-22-155852"], or rows selected from catalog().
+        root (str, optional): Data root the keys are relative to. Defaults to "data".
+        sample_fraction, degradation, sensors, columns, time_range, sampling,
+            block_duration: As for access.data(). Each session is sampled and degraded with
+            session_seed(seed, session).
+        seed (int, optional): Seed for the sampling and the degradation. Defaults to 0.
+        workers (int, optional): Sessions loaded concurrently.
+
+    Returns:
+        pd.DataFrame or None: The access.data() format of every session, one contiguous block
+        of rows per session in the given order, with a categorical session column.
+        None if no session could be loaded.
+    """
+    if isinstance(sessions, pd.DataFrame):
+        sessions = sessions["session"]
+    keys = list(dict.fromkeys(sessions))
+    if not keys:
+        logger.error("No sessions to load")
+        print("Error: No sessions to load")
+        return None
+
+    def load(key):
+        loaded = dataset(
+            os.path.join(root, key), sample_fraction, degradation, session_seed(seed, key),
+            sensors=sensors, columns=columns, time_range=time_range,
+            sampling=sampling, block_duration=block_duration,
+        )
+        if loaded is None:
+            logger.error(f"Could not load session {key}")
+            return None
+        df = loaded.to_long()
+        df["session"] = pd.Categorical.from_codes(
+            np.full(len(df), keys.index(key), dtype=np.int16), dtype=pd.CategoricalDtype(keys)
+        )
+        return df
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        frames = [df for df in pool.map(load, keys) if df is not None]
+    if not frames:
+        logger.error("No valid data loaded from any session")
+        print("Error: No valid data loaded from any session")
+        return None
+
+    combined = pd.concat(frames, ignore_index=True)
+    logger.info(f"Loaded {len(frames)} of {len(keys)} sessions: {len(combined)} rows")
+    return combined
@@ -1,9 +1,8 @@
-from typing import Union
+from typing import Optional, Tuple, Union
 import pandas as pd
 import logging
 import os
-import json
-import numpy as np
+import sys
 
 # Set up basic logging
 logging.basicConfig(
@@ -11,154 +10,150 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-def data(folder: str = "data", sample_fraction: float = 0.8) -> Union[pd.DataFrame, None]:
+# The reading, caching, export, streaming and catalog code lives in modules under
+# __access/, imported by name the way transfer.py imports sensor_log. Settings such as
+# frame_cache.CACHE_DIR or sensor_reader.CSV_ENGINE are changed on those modules.
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "__access"))
+import frame_cache  # noqa: E402
+import export_sinks  # noqa: E402
+import sensor_degradation  # noqa: E402
+import sensor_reader  # noqa: E402
+import sensor_stream  # noqa: E402
+import session_catalog  # noqa: E402
+from sensor_degradation import (  # noqa: E402
+    DEGRADATION_PARAMS, DEFAULT_DEGRADATION, sensor_profile, sensor_rng, degrade_arrays, degrade,
+)
+from sensor_reader import (  # noqa: E402
+    SensorBlock, SensorFrames, SensorDataset, csv_schema, TIME_INDEX_STRIDE, time_index_path, csv_time_index,
+    SAMPLING_MODES, DEFAULT_BLOCK_DURATION, sample_blocks, sample_rng, load_sensor_config, frames,
+    select_columns, dataset, sampled_ranges,
+)
+from frame_cache import (  # noqa: E402
+    source_fingerprint, cache_key, save_frame, load_frame, cache_get, cache_put, evict_cache,
+)
+from export_sinks import ExportSink, CSVSink, BinarySink, ArtifactSink, export, flush_exports  # noqa: E402
+from sensor_stream import DEFAULT_CHUNK_DURATION, CHUNK_READ_AHEAD, chunk_ranges, iter_dataset, iter_data  # noqa: E402
+from session_catalog import (  # noqa: E402
+    SESSION_VARIANTS, CATALOG_NAME, find_sessions, sensor_stats, catalog, session_seed, load_sessions,
+)
+
+
+def data(
+    folder: str = "data",
+    sample_fraction: float = 0.8,
+    degradation: Optional[dict] = None,
+    seed: int = 0,
+    workers: Optional[int] = None,
+    sensors: Optional[list] = None,
+    columns: Optional[list] = None,
+    time_range: Optional[Tuple[float, float]] = None,
+    cache: Optional[bool] = None,
+    export_to: Union[ExportSink, list, None] = None,
+    sampling: str = "blocks",
+    block_duration: float = DEFAULT_BLOCK_DURATION,
+) -> Union[pd.DataFrame, None]:
     """
     Read the data from a folder (default = "data"), returning a structured format such as a DataFrame.
-    If sensor is specified, loads data for that sensor only. If sensor is None or empty, combines data
-    from all CSV-convertible sensors listed in sensors.json in a sparse wide format with a sensor column.
-    Randomly drops rows for each sensor type before combining, based on the sample_fraction.
+    Combines the selected CSV-capable sensors listed in sensors.json (all of them by default) in a
+    sparse wide format with a categorical sensor column, keeping sample_fraction of the readings.
 
     IMPLEMENTATION GUIDE
     ====================
 
     1. LOAD DATA:
        - Loads sensors.json from robot/controllers/drive_robot/sensors.json.
-       - If sensor is specified, loads only that sensor's data.csv.
-       - If sensor is None or empty, loads and combines data from all CSV-convertible sensors.
-       - Folder defaults to "data".
+       - Only the files of `sensors` and only `columns` are read, and with time_range only
+         the rows t0 <= sim_time <= t1, located through each CSV's time index (see _read_sensor()).
+       - Prefers a sensor's typed <name>.npy / <name>_sim_time.npy columns over its CSV when present.
        - Dynamically creates a unified column set from csv_columns in sensors.json.
-       - Randomly samples rows for each sensor's data based on sample_fraction.
-
-    2. ERROR HANDLING:
+       - Reads the sensor files concurrently on `workers` threads with an explicit schema:
+         float64 sim_time, float32 values and a categorical sensor column.
+       - Samples sample_fraction of the readings while reading, reproducibly for a given
+         seed: whole block_duration-long sim_time blocks shared by all sensors
+         (sampling="blocks"), or uniformly chosen rows per sensor (sampling="rows").
+         Unselected rows are never parsed.
+       - If a degradation profile is given, degrades each sensor's clean readings at load
+         time (see degrade()), reproducibly for a given seed, instead of reading a
+         materialized noisy copy.
+       - The sensors are loaded as a SensorDataset (see dataset()) and laid out in the
+         sparse wide format by SensorDataset.to_long().
+
+    2. CACHE:
+       - With cache enabled, the frame is stored under frame_cache.CACHE_DIR, keyed by the folder,
+         the size and mtime of its sensor files and of sensors.json, and the arguments
+         that change the result (all but workers and export_to; see cache_key()).
+       - A later call with the same key loads the stored frame memory-mapped instead of
+         reading the session; changing any source file gives a new key. Entries used
+         longest ago are evicted beyond frame_cache.CACHE_MAX_BYTES (see evict_cache()).
+       - Exports to export_to happen on cache hits too.
+
+    3. ERROR HANDLING:
+       - Invalid degradation profile, sampling or selection → log + return None
        - Missing folder → log + return None
        - Missing file → log + return None
        - Other unexpected errors → log + return None
 
-    3. LOGGING:
+    4. LOGGING:
        - Logs when data loading starts
        - Logs success with row/column summary
        - Logs detailed error messages
 
     Args:
-        folder (str, optional): Path to folder containing sensor data CSVs. Defaults to "data".
-        sample_fraction (float, optional): Fraction of rows to keep for each sensor (0.0 to 1.0). Defaults to 0.8.
+        folder (str, optional): Path to the session folder holding the sensor files. Defaults to "data".
+        sample_fraction (float, optional): Fraction of readings to keep (0.0 to 1.0). Defaults to 0.8.
+        degradation (dict, optional): Degradation profile, e.g. DEFAULT_DEGRADATION. Keys are listed in
+            DEGRADATION_PARAMS; a "sensors" entry maps sensor names to per-sensor overrides. Defaults to None
+            (clean data).
+        seed (int, optional): Seed for the sampling and the degradation. Defaults to 0.
+        workers (int, optional): Threads reading sensor files concurrently. Defaults to the
+            ThreadPoolExecutor default for this machine.
+        sensors (list, optional): Sensor names to load. Defaults to every CSV-capable sensor.
+        columns (list, optional): csv_columns to load, e.g. ["x", "y", "z"]; sensors with
+            none of them are skipped. Defaults to all.
+        time_range (tuple, optional): (t0, t1) in sim_time seconds; only readings with
+            t0 <= sim_time <= t1 are read. A degradation profile is then applied to
+            those readings alone. Defaults to the whole session.
+        cache (bool, optional): Use the on-disk frame cache described above. Defaults to
+            frame_cache.CACHE_ENABLED (on unless FYNESSE_CACHE=0).
+        export_to (ExportSink or list, optional): Sinks the frame is exported to as "x"
+            on a background thread, e.g. CSVSink(".") for the former x.csv. Defaults to
+            None (no export).
+        sampling (str, optional): "blocks" keeps sample_fraction of the session's
+            block_duration-long time blocks, the same blocks for every sensor; "rows" keeps
+            uniformly chosen rows. Defaults to "blocks".
+        block_duration (float, optional): Block length in seconds for sampling="blocks".
+            Defaults to DEFAULT_BLOCK_DURATION.
 
     Returns:
         pd.DataFrame or None: DataFrame in sparse wide format with sensor column or None on error.
     """
-    logger.info(f"Starting data access operation in folder: {folder}")
-
-    # Validate sample_fraction
-    if not 0.0 <= sample_fraction <= 1.0:
-        logger.error(f"Invalid sample_fraction: {sample_fraction}. Must be between 0.0 and 1.0.")
-        print(f"Error: Invalid sample_fraction -> {sample_fraction}. Must be between 0.0 and 1.0.")
-        return None
-
-    # Ensure folder exists
-    if not os.path.exists(folder):
-        logger.error(f"Folder not found: {folder}")
-        print(f"Error: Folder not found -> {folder}")
-        return None
-
-    # Load sensors.json
-    sensors_file = os.path.join("robot", "controllers", "drive_robot", "sensors.json")
+    key = None
+    if frame_cache.CACHE_ENABLED if cache is None else cache:
+        key = cache_key("access.data", folder, {
+            "sample_fraction": sample_fraction, "degradation": degradation, "seed": seed,
+            "sensors": sensors, "columns": columns, "time_range": time_range,
+            "sampling": sampling, "block_duration": block_duration,
+        })
+    combined_df = cache_get(key) if key else None
+
+    # Combine all sensors
     try:
-        with open(sensors_file, 'r') as f:
-            sensors_config = json.load(f)
-    except FileNotFoundError:
-        logger.error(f"Sensors configuration file not found: {sensors_file}")
-        print(f"Error: Could not find sensors.json -> {sensors_file}")
-        return None
-    except json.JSONDecodeError as e:
-        logger.error(f"Error parsing sensors.json: {e}")
-        print(f"Error parsing sensors.json: {e}")
-        return None
-    except Exception as e:
-        logger.error(f"Unexpected error loading sensors.json: {e}")
-        print(f"Error loading sensors.json: {e}")
-        return None
-
-    # Filter sensors that can be converted to CSV
-    csv_sensors = [s for s in sensors_config if s.get("can_csv", False)]
-
-    # Dynamically create unified column set from csv_columns
-    all_columns = set()
-    for sensor in csv_sensors:
-        all_columns.update(sensor["csv_columns"])
-    all_columns = list(all_columns) + ["sensor"]
-
-    # If no sensor specified, combine data from all CSV-convertible sensors
-    dataframes = []
-    for s in csv_sensors:
-        sensor_name = s["name"]
-        file_path = os.path.join(folder, f"{sensor_name}.csv")
-        try:
-            logger.info(f"Loading data from {file_path}")
-            df = pd.read_csv(file_path)
-
-            if df.empty:
-                logger.warning(f"Loaded file is empty: {file_path}")
-                print(f"Warning: The file {file_path} is empty.")
-                continue
-
-            # Randomly sample rows
-            if sample_fraction < 1.0:
-                original_rows = len(df)
-                df = df.sample(frac=sample_fraction, random_state=np.random.randint(0, 10000))
-                logger.info(f"Sampled {len(df)} rows from {original_rows} for {sensor_name} (fraction: {sample_fraction})")
-
-            # Map sensor-specific columns to unified columns
-            column_mapping = {
-                f"value_{i}": name for i, name in enumerate(s["csv_columns"])
-            }
-            column_mapping["sim_time"] = "sim_time"  # keep time as is
-
-            df = df.rename(columns=column_mapping)
-
-            # Add sensor column
-            df["sensor"] = sensor_name
-
-            # Ensure all unified columns are present, fill with NaN where needed
-            for col in all_columns:
-                if col not in df.columns:
-                    df[col] = pd.NA
-
-            dataframes.append(df)
-            logger.info(
-                f"Successfully loaded data for {sensor_name}: {len(df)} rows, {len(df.columns)} columns"
+        if combined_df is None:
+            loaded = dataset(
+                folder, sample_fraction, degradation, seed, workers, sensors, columns, time_range,
+                sampling, block_duration,
             )
-
-        except FileNotFoundError:
-            logger.error(f"Data file not found: {file_path}")
-            print(f"Error: Could not find file -> {file_path}")
-            continue
-        except PermissionError:
-            logger.error(f"Permission denied when accessing: {file_path}")
-            print(f"Error: Permission denied -> {file_path}")
-            continue
-        except Exception as e:
-            logger.error(f"Unexpected error loading data: {e}")
-            print(f"Error loading data from {file_path}: {e}")
-            continue
-
-    if not dataframes:
-        logger.error("No valid data loaded from any sensor")
-        print("Error: No valid data loaded from any sensor")
-        return None
-
-    # Combine all DataFrames
-    try:
-        combined_df = pd.concat(dataframes, ignore_index=True)
+            if loaded is None:
+                return None
+            combined_df = loaded.to_long()
+            if key:
+                cache_put(key, combined_df)
         logger.info(
             f"Successfully combined data: {len(combined_df)} rows, {len(combined_df.columns)} columns"
         )
 
-        # Try save to csv for inspection
-        try:
-            combined_df.to_csv('x.csv')
-        except Exception as e:
-            logger.error(f"Error saving combined DataFrame to CSV: {e}")
-            print(f"Error saving combined DataFrame to CSV: {e}")
+        # Export for inspection only when asked to, off the loading path
+        export(combined_df, "x", export_to)
 
         print("Data access test completed.")
 
@@ -9,7 +9,7 @@ This module handles question addressing functionality including:
 """
 
 from assess import data
-from typing import Any, Union
+from typing import Any, Iterable, Tuple, Union
 import pandas as pd
 import numpy as np
 import logging
@@ -282,6 +282,70 @@ def analyze_data(data: Union[pd.DataFrame, Any]) -> pd.DataFrame:
         print(f"Error analyzing data: {e}")
         return pd.DataFrame()
 
+def _chunk_moments(values: np.ndarray) -> Tuple[np.ndarray, ...]:
+    """Per-column count, mean, sum of squared deviations, min and max, ignoring NaN."""
+    finite = ~np.isnan(values)
+    count = finite.sum(axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.where(finite, values, 0.0).sum(axis=0) / count
+        m2 = np.where(finite, (values - mean) ** 2, 0.0).sum(axis=0)
+    low = np.where(finite, values, np.inf).min(axis=0)
+    high = np.where(finite, values, -np.inf).max(axis=0)
+    return count, np.nan_to_num(mean), m2, low, high
+
+def _merge_moments(a: Tuple[np.ndarray, ...], b: Tuple[np.ndarray, ...]) -> Tuple[np.ndarray, ...]:
+    """Combine two _chunk_moments() results (Chan et al.'s parallel variance update)."""
+    count = a[0] + b[0]
+    delta = b[1] - a[1]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.where(count > 0, a[1] + delta * b[0] / count, 0.0)
+        m2 = np.where(count > 0, a[2] + b[2] + delta ** 2 * a[0] * b[0] / count, 0.0)
+    return count, mean, m2, np.minimum(a[3], b[3]), np.maximum(a[4], b[4])
+
+def stream_statistics(chunks: Iterable[pd.DataFrame], by_sensor: bool = False) -> pd.DataFrame:
+    """
+    The analyze_data() statistics computed by consuming a stream of chunks, e.g. from
+    access.iter_data(), holding one chunk at a time. Count, mean, std, min and max are
+    merged exactly across chunks; the median needs every value and is not computed.
+
+    Args:
+        chunks (iterable of pd.DataFrame): Chunks in the access.data() format.
+        by_sensor (bool, optional): One row per sensor and column instead of per column.
+            Defaults to False.
+
+    Returns:
+        pd.DataFrame: count, mean, std (ddof=1), min and max per numeric column, with a
+        column (and sensor) column like analyze_data().
+    """
+    moments = {}
+    for chunk in chunks:
+        numeric_columns = list(chunk.select_dtypes(include=["number"]).columns)
+        groups = chunk.groupby("sensor", observed=True, sort=False) if by_sensor else [(None, chunk)]
+        for sensor, group in groups:
+            for col, stats in zip(numeric_columns, zip(*_chunk_moments(group[numeric_columns].to_numpy(np.float64)))):
+                key = (sensor, col)
+                moments[key] = stats if key not in moments else _merge_moments(moments[key], stats)
+
+    if not moments:
+        logger.error("No data in the stream to analyze")
+        print("Error: No data in the stream to analyze")
+        return pd.DataFrame()
+
+    rows = []
+    for (sensor, col), (count, mean, m2, low, high) in moments.items():
+        if count == 0:
+            continue
+        row = {"sensor": sensor} if by_sensor else {}
+        row.update({
+            "column": col, "count": int(count), "mean": float(mean),
+            "std": float(np.sqrt(m2 / (count - 1))) if count > 1 else np.nan,
+            "min": float(low), "max": float(high),
+        })
+        rows.append(row)
+    stats_df = pd.DataFrame(rows)
+    logger.info(f"Computed streaming statistics for {len(stats_df)} columns")
+    return stats_df
+
 # Example usage
 if __name__ == "__main__":
     # Example folder path - replace with actual path as needed
@@ -1,4 +1,4 @@
-from typing import Any, Union
+from typing import Any, Iterable, Optional, Tuple, Union
 import pandas as pd
 pd.set_option("future.no_silent_downcasting", True)
 import numpy as np
@@ -30,22 +30,36 @@ How are missing values encoded, how are outliers encoded? What do columns repres
 makes rure they are correctly labeled. How is the data indexed. Crete visualisation
 routines to assess the data (e.g. in bokeh). Ensure that date formats are correct
 and correctly timezoned."""
-def fill_missing_per_sensor(df: pd.DataFrame, interval: float = 0.016) -> pd.DataFrame:
+def fill_missing_per_sensor(
+    df: pd.DataFrame,
+    interval: float = 0.016,
+    export_to: Union[access.ExportSink, list, None] = None,
+    ranges: Optional[list] = None,
+) -> pd.DataFrame:
     """
     Restore missing sim_time values per sensor at fixed intervals,
-    forward filling other values.
+    forward filling other values. With ranges (see access.sampled_ranges()), the
+    timeline is only restored within each (t0, t1) range, so time blocks left out by
+    sampling stay empty. The result is exported as "xffilled_data" to the
+    export_to sinks, if any (see access.export()).
     """
     filled_dfs = []
 
-    for sensor, group in df.groupby("sensor"):
+    for sensor, group in df.groupby("sensor", observed=True):
         logger.info(f"Processing sensor '{sensor}' with {len(group)} rows")
 
         group = group.sort_values("sim_time").set_index("sim_time")
         sim_time_min = group.index.min()
         sim_time_max = group.index.max()
 
-        # Generate expected timeline with interval spacing
-        expected_times = np.arange(sim_time_min, sim_time_max + interval/2, interval)
+        # Generate expected timeline with interval spacing, within each range read
+        times = group.index.to_numpy()
+        expected_times = []
+        for t0, t1 in ranges if ranges is not None else [(sim_time_min, sim_time_max)]:
+            inside = times[(times >= t0) & (times <= t1)]
+            if len(inside):
+                expected_times.append(np.arange(inside[0], inside[-1] + interval / 2, interval))
+        expected_times = np.concatenate(expected_times) if expected_times else np.array([])
         logger.info(
             f"  Sensor '{sensor}': expected {len(expected_times)} intervals "
             f"(from {sim_time_min:.3f}s to {sim_time_max:.3f}s)"
@@ -71,19 +85,47 @@ def fill_missing_per_sensor(df: pd.DataFrame, interval: float = 0.016) -> pd.Dat
         filled_dfs.append(group_filled)
 
     combined = pd.concat(filled_dfs, ignore_index=True)
-    try:
-        combined.to_csv("xffilled_data.csv", index=False)
-    except Exception as e:
-        logger.error(f"Error saving filled data: {e}")
+    if isinstance(df["sensor"].dtype, pd.CategoricalDtype):
+        combined["sensor"] = combined["sensor"].astype(df["sensor"].dtype)
+    access.export(combined, "xffilled_data", export_to)
     logger.info(f"All sensors combined: {len(combined)} rows total")
     return combined
 
 
-def data(folder: str = "data") -> Union[pd.DataFrame, Any]:
+def data(
+    folder: str = "data",
+    degradation: Optional[dict] = None,
+    seed: int = 0,
+    sensors: Optional[list] = None,
+    columns: Optional[list] = None,
+    time_range: Optional[Tuple[float, float]] = None,
+    sample_fraction: float = 0.8,
+    interval: float = 0.016,
+    cache: Optional[bool] = None,
+    export_to: Union[access.ExportSink, list, None] = None,
+    sampling: str = "blocks",
+    block_duration: float = access.DEFAULT_BLOCK_DURATION,
+) -> Union[pd.DataFrame, Any]:
     """
     Load the data from access and ensure missing values are correctly encoded, indices are correct,
     column names are informative, and date/times are correctly formatted.
 
+    Args:
+        folder (str, optional): Session folder passed to access.data(). Defaults to "data".
+        degradation (dict, optional): Degradation profile applied by access.data() at load time.
+        seed (int, optional): Seed for the degradation. Defaults to 0.
+        sensors, columns, time_range (optional): Selection pushed down to access.data(), so
+            only those sensors, columns and (t0, t1) sim_time window are read.
+        sample_fraction, sampling, block_duration (optional): How access.data() samples
+            the session while reading. Defaults to 0.8 of its 5 s time blocks.
+        interval (float, optional): Sampling interval fill_missing_per_sensor() restores.
+            Defaults to 0.016.
+        cache (bool, optional): Reuse the assessed frame from the on-disk cache when the
+            session's files and these arguments are unchanged (see access.cache_key()).
+            Defaults to access.frame_cache.CACHE_ENABLED.
+        export_to (ExportSink or list, optional): Sinks the loaded ("x") and filled
+            ("xffilled_data") frames are exported to, see access.export(). Defaults to None.
+
     Returns:
         pd.DataFrame or None: Cleaned DataFrame or None on error.
     """
@@ -123,8 +165,35 @@ def data(folder: str = "data") -> Union[pd.DataFrame, Any]:
     """
     logger.info("Starting data assessment")
 
-    # Load data from access module
-    df = access.data(folder)
+    # Reuse the assessed frame when neither the session nor the arguments changed
+    key = None
+    if access.frame_cache.CACHE_ENABLED if cache is None else cache:
+        key = access.cache_key("assess.data", folder, {
+            "sample_fraction": sample_fraction, "degradation": degradation, "seed": seed,
+            "sensors": sensors, "columns": columns, "time_range": time_range, "interval": interval,
+            "sampling": sampling, "block_duration": block_duration,
+        })
+    cached = access.cache_get(key) if key else None
+    if cached is not None:
+        if export_to:
+            # Only the assessed frame is cached; reload the "x" frame when it is to be exported
+            access.data(
+                folder, sample_fraction=sample_fraction, degradation=degradation, seed=seed,
+                sensors=sensors, columns=columns, time_range=time_range, cache=False, export_to=export_to,
+                sampling=sampling, block_duration=block_duration,
+            )
+        access.export(cached, "xffilled_data", export_to)
+        logger.info(f"Data assessment loaded from cache. Final shape: {cached.shape}")
+        print(f"Data assessment completed: {len(cached)} rows, {len(cached.columns)} columns (cached)")
+        return cached
+
+    # Load data from access module. The assessed frame is cached below, so caching the
+    # loaded frame as well would store every session twice
+    df = access.data(
+        folder, sample_fraction=sample_fraction, degradation=degradation, seed=seed,
+        sensors=sensors, columns=columns, time_range=time_range, cache=False, export_to=export_to,
+        sampling=sampling, block_duration=block_duration,
+    )
     if df is None:
         logger.error("No data available from access module")
         print("Error: Could not load data from access module")
@@ -146,18 +215,23 @@ def data(folder: str = "data") -> Union[pd.DataFrame, Any]:
             logger.warning(f"Found {df['sim_time'].isnull().sum()} missing sim_time values")
             print(f"Warning: Found {df['sim_time'].isnull().sum()} missing sim_time values")
 
-        # Fill missing values per sensor
+        # Fill missing values per sensor, within the time ranges actually read
         logger.info("Restoring missing values per sensor with 16ms intervals + forward fill")
-        df = fill_missing_per_sensor(df)
+        ranges = access.sampled_ranges(
+            folder, sample_fraction, seed, sensors, columns, time_range, sampling, block_duration
+        )
+        df = fill_missing_per_sensor(df, interval, export_to, ranges)
 
         # Fill non-numeric columns (e.g., sensor already handled, others get placeholder)
-        if "sensor" in df.columns:
+        if "sensor" in df.columns and df["sensor"].isnull().any():
+            if isinstance(df["sensor"].dtype, pd.CategoricalDtype):
+                df["sensor"] = df["sensor"].cat.add_categories("unknown")
             df["sensor"] = df["sensor"].fillna("unknown")
             logger.info("Filled missing sensor values with 'unknown'")
 
         # Validate data types
         for col in df.columns:
-            if col not in ["sim_time", "sensor"] and df[col].dtype not in [np.float64, np.int64]:
+            if col not in ["sim_time", "sensor"] and not pd.api.types.is_numeric_dtype(df[col]):
                 logger.warning(f"Column {col} has unexpected type {df[col].dtype}, converting to float64")
                 df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0)
 
@@ -165,6 +239,9 @@ def data(folder: str = "data") -> Union[pd.DataFrame, Any]:
         df = df.set_index("sim_time", drop=False)
         logger.info("Set sim_time as index for time-series analysis")
 
+        if key:
+            access.cache_put(key, df)
+
         # Log final data summary
         logger.info(f"Data assessment completed. Final shape: {df.shape}")
         print(f"Data assessment completed: {len(df)} rows, {len(df.columns)} columns")
@@ -180,6 +257,70 @@ def data(folder: str = "data") -> Union[pd.DataFrame, Any]:
         print(f"Error assessing data: {e}")
         return None
 
+def stream_quality(chunks: Iterable[pd.DataFrame], interval: float = 0.016) -> pd.DataFrame:
+    """
+    Data-quality summary of a session consumed chunk by chunk, e.g. from
+    access.iter_data(), so it never holds more than one chunk. Gaps are tracked
+    across chunk boundaries, so the result does not depend on the chunk duration.
+
+    Args:
+        chunks (iterable of pd.DataFrame): Time-ordered chunks in the access.data() format.
+        interval (float, optional): Expected sampling interval; a step between
+            consecutive readings longer than 1.5 intervals counts as a gap. Defaults to 0.016.
+
+    Returns:
+        pd.DataFrame: One row per sensor with rows, first and last sim_time, gaps,
+        max_gap, expected_rows (what fill_missing_per_sensor() would restore) and
+        missing_values (NaNs in the columns the sensor reports).
+    """
+    stats = {}
+    for chunk in chunks:
+        if len(chunk) == 0:
+            continue
+        value_columns = [col for col in chunk.columns if col not in ("sim_time", "sensor")]
+        # Sort the chunk by sensor, then time, and reduce each sensor's run of rows
+        codes, names = pd.factorize(chunk["sensor"])
+        chunk_times = chunk["sim_time"].to_numpy(dtype=np.float64)
+        order = np.lexsort((chunk_times, codes))
+        codes, chunk_times = codes[order], chunk_times[order]
+        starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+        ends = np.r_[starts[1:], len(codes)]
+        non_null = np.add.reduceat(chunk[value_columns].notna().to_numpy()[order].astype(np.int64), starts, axis=0)
+        for start, end, counts in zip(starts, ends, non_null):
+            sensor = names[codes[start]]
+            times = chunk_times[start:end]
+            st = stats.get(sensor)
+            if st is None:
+                st = stats[sensor] = {
+                    "rows": 0, "first": times[0], "last": None, "gaps": 0, "max_gap": 0.0,
+                    "non_null": pd.Series(0, index=value_columns),
+                }
+            steps = np.diff(times if st["last"] is None else np.concatenate([[st["last"]], times]))
+            if len(steps):
+                st["gaps"] += int((steps > 1.5 * interval).sum())
+                st["max_gap"] = max(st["max_gap"], float(steps.max()))
+            st["rows"] += len(times)
+            st["last"] = times[-1]
+            st["non_null"] = st["non_null"].add(pd.Series(counts, index=value_columns), fill_value=0)
+
+    if not stats:
+        logger.error("No data in the stream to assess")
+        print("Error: No data in the stream to assess")
+        return pd.DataFrame()
+
+    rows = []
+    for sensor, st in stats.items():
+        reported = st["non_null"][st["non_null"] > 0]
+        rows.append({
+            "sensor": sensor, "rows": st["rows"], "first": st["first"], "last": st["last"],
+            "gaps": st["gaps"], "max_gap": st["max_gap"],
+            "expected_rows": len(np.arange(st["first"], st["last"] + interval / 2, interval)),
+            "missing_values": int(len(reported) * st["rows"] - reported.sum()),
+        })
+    summary = pd.DataFrame(rows).set_index("sensor")
+    logger.info(f"Assessed stream of {int(summary['rows'].sum())} readings from {len(summary)} sensors")
+    return summary
+
 def query(data: Union[pd.DataFrame, Any]) -> str:
     """
     Request user input to explore specific aspects of the data.
@@ -221,6 +362,48 @@ def query(data: Union[pd.DataFrame, Any]) -> str:
         logger.error(f"Error processing query: {e}")
         return f"Error processing query: {e}"
 
+def frame_summary(frames: access.SensorFrames, batch_frames: int = 64) -> pd.DataFrame:
+    """
+    Per-frame quality summary of a heavy sensor (lidar, depth) from access.frames() or
+    access.dataset(...).frames. Frames are read batch by batch from the memory map, so
+    memory is bounded by batch_frames, not by the session length.
+
+    Ranges are the point distances for point clouds and the values themselves otherwise.
+
+    Args:
+        frames (access.SensorFrames): Memory-mapped frames, e.g. sliced with between().
+        batch_frames (int): Frames read per batch.
+
+    Returns:
+        pd.DataFrame: Indexed by sim_time, with the number and fraction of finite ranges
+        per frame (valid, valid_fraction) and their min, mean and max.
+    """
+    summaries = []
+    for times, batch in frames.batches(batch_frames):
+        batch = np.asarray(batch, dtype=np.float32)
+        if frames.kind == "point_cloud":
+            ranges = np.linalg.norm(batch, axis=-1)
+        else:
+            ranges = batch.reshape(len(batch), -1)
+        finite = np.isfinite(ranges)
+        valid = finite.sum(axis=1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            summaries.append(pd.DataFrame({
+                "valid": valid,
+                "valid_fraction": valid / ranges.shape[1],
+                "range_min": np.where(finite, ranges, np.inf).min(axis=1),
+                "range_mean": np.where(finite, ranges, 0).sum(axis=1) / valid,
+                "range_max": np.where(finite, ranges, -np.inf).max(axis=1),
+            }, index=pd.Index(np.array(times), name="sim_time")))
+    if not summaries:
+        return pd.DataFrame(columns=["valid", "valid_fraction", "range_min", "range_mean", "range_max"],
+                            index=pd.Index([], name="sim_time", dtype=np.float64))
+    summary = pd.concat(summaries)
+    empty = summary["valid"] == 0
+    summary.loc[empty, ["range_min", "range_max"]] = np.nan
+    logger.info(f"Summarized {len(summary)} {frames.name} frames ({int(empty.sum())} without valid ranges)")
+    return summary
+
 def view(data: Union[pd.DataFrame, Any]) -> None:
     """
     Provide a Bokeh visualization to verify data quality (e.g., time series plot).
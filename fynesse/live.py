@@ -0,0 +1,200 @@
+"""
+Live access to a running drive_robot controller.
+
+When the controller is started with DRIVE_ROBOT_LIVE_STREAM=<name>, it publishes every
+logged step's low-dimensional readings into a shared-memory ring. StepStream attaches
+to that ring from another process and yields the steps as zero-copy NumPy views, or as
+small DataFrames in the same long format as access.data(), so assess-style checks can
+run during a drive instead of after the full conversion pipeline.
+"""
+import json
+import logging
+import struct
+import threading
+import time
+from multiprocessing import resource_tracker, shared_memory
+from typing import Dict, Iterator, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Shared-memory layout, must match robot/controllers/drive_robot/step_stream.py
+MAGIC = b"FYNSTRM1"
+HEADER_SIZE = 4096
+HEADER = struct.Struct("<8sIIQI")
+STEPS_OFFSET = 16
+
+
+_attach_lock = threading.Lock()
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    # The publisher owns the block; keep it out of this process's resource tracker so
+    # it is not unlinked when this reader exits
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)  # type: ignore[call-arg]
+    except TypeError:
+        pass
+    # Before Python 3.13 attaching always registers the block. Skip the registration
+    # rather than undoing it: when the publisher runs in this process, an unregister
+    # here would also drop the publisher's own registration
+    register = resource_tracker.register
+    with _attach_lock:
+        resource_tracker.register = lambda rname, rtype: (  # type: ignore[assignment]
+            None if rtype == "shared_memory" else register(rname, rtype)
+        )
+        try:
+            return shared_memory.SharedMemory(name=name)
+        finally:
+            resource_tracker.register = register  # type: ignore[assignment]
+
+
+class StepStream:
+    """
+    Reader for a controller's live step ring.
+
+    Args:
+        name (str): Shared-memory name the controller publishes to.
+
+    Raises:
+        FileNotFoundError: If no controller is publishing under that name.
+        ValueError: If the block is not a step stream.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._shm = _attach(name)
+        buf = self._shm.buf
+        magic, capacity, slot_size, _, layout_len = HEADER.unpack(bytes(buf[:HEADER.size]))
+        if magic != MAGIC:
+            self._shm.close()
+            raise ValueError(f"Shared memory '{name}' is not a drive_robot step stream")
+        self.capacity = capacity
+        self.fields = json.loads(bytes(buf[HEADER.size:HEADER.size + layout_len]).decode())["fields"]
+        # np.frombuffer keeps the block exported, so it cannot be unmapped under live views
+        self._steps = np.frombuffer(buf, dtype=np.uint64, count=1, offset=STEPS_OFFSET)
+        ring = np.frombuffer(buf, dtype=np.uint8, count=capacity * slot_size, offset=HEADER_SIZE).reshape(
+            capacity, slot_size
+        )
+        self._seq = ring[:, 0:8].view(np.uint64)[:, 0]
+        self._time = ring[:, 8:16].view(np.float64)[:, 0]
+        self._valid = ring[:, 16:16 + len(self.fields)]
+        self._values = {}
+        for field in self.fields:
+            size = int(np.prod(field["shape"]))
+            start = field["offset"]
+            self._values[field["name"]] = ring[:, start:start + 4 * size].view(np.float32).reshape(
+                (capacity,) + tuple(field["shape"])
+            )
+        self.missed = 0
+        logger.info(f"Attached to live stream '{name}' with {len(self.fields)} sensors, capacity {capacity}")
+
+    def steps_published(self) -> int:
+        """Number of steps the controller has published so far."""
+        return int(self._steps[0])
+
+    def iter_steps(
+        self,
+        start: Optional[int] = None,
+        timeout: Optional[float] = 5.0,
+        poll_interval: float = 0.002,
+        copy: bool = False,
+    ) -> Iterator[Tuple[int, float, Dict[str, np.ndarray]]]:
+        """
+        Yield (step, sim_time, readings) for every published step, in order.
+
+        readings maps each sensor logged on that step to a zero-copy view into the ring.
+        Views are overwritten once the ring laps them, so copy anything kept longer
+        than `capacity` steps, and release them before close(). With copy=True the
+        readings are copied out instead, and a step is only yielded if the slot's
+        sequence number is unchanged after the copy, so it is never torn. Steps lost
+        because the reader fell behind are skipped and counted in self.missed.
+
+        Args:
+            start (int, optional): First step to read. Defaults to the next new step.
+            timeout (float, optional): Stop after this many seconds without a new step.
+                None waits forever.
+            poll_interval (float): Sleep between checks for new steps, in seconds.
+            copy (bool): Copy the readings out of the ring. Defaults to False.
+        """
+        step = self.steps_published() if start is None else start
+        last_data = time.monotonic()
+        while True:
+            published = self.steps_published()
+            if step >= published:
+                if timeout is not None and time.monotonic() - last_data > timeout:
+                    return
+                time.sleep(poll_interval)
+                continue
+            if published - step > self.capacity:
+                self.missed += published - self.capacity - step
+                step = published - self.capacity
+            slot = step % self.capacity
+            if int(self._seq[slot]) != step + 1:
+                # Overwritten by a newer step while we were catching up
+                self.missed += 1
+                step += 1
+                continue
+            sim_time = float(self._time[slot])
+            valid = self._valid[slot].copy()
+            readings = {}
+            for i, field in enumerate(self.fields):
+                if valid[i]:
+                    values = self._values[field["name"]][slot]
+                    readings[field["name"]] = values.copy() if copy else values
+            if int(self._seq[slot]) != step + 1:
+                # Lapped while being read: what was read may mix two steps
+                self.missed += 1
+                step += 1
+                continue
+            last_data = time.monotonic()
+            yield step, sim_time, readings
+            step += 1
+
+    def iter_frames(self, batch_steps: int = 64, **kwargs) -> Iterator[pd.DataFrame]:
+        """
+        Yield DataFrames of batch_steps consecutive steps in the access.data() long
+        format: a sim_time column, the sensor's csv_columns and a sensor column.
+        Values are copied out of the ring with iter_steps(copy=True), so no row is torn
+        by the publisher lapping the reader. Keyword arguments go to iter_steps().
+        """
+        columns = {field["name"]: field["columns"] or [f"value_{i}" for i in range(int(np.prod(field["shape"])))]
+                   for field in self.fields}
+        rows: Dict[str, list] = {name: [] for name in columns}
+        times: Dict[str, list] = {name: [] for name in columns}
+        count = 0
+        for _, sim_time, readings in self.iter_steps(copy=True, **kwargs):
+            for name, values in readings.items():
+                rows[name].append(values.reshape(-1))
+                times[name].append(sim_time)
+            count += 1
+            if count == batch_steps:
+                yield self._to_frame(columns, times, rows)
+                rows = {name: [] for name in columns}
+                times = {name: [] for name in columns}
+                count = 0
+        if count:
+            yield self._to_frame(columns, times, rows)
+
+    @staticmethod
+    def _to_frame(columns: Dict[str, list], times: Dict[str, list], rows: Dict[str, list]) -> pd.DataFrame:
+        frames = []
+        for name, values in rows.items():
+            if not values:
+                continue
+            df = pd.DataFrame(np.vstack(values), columns=columns[name])
+            df.insert(0, "sim_time", times[name])
+            df["sensor"] = name
+            frames.append(df)
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=["sim_time", "sensor"])
+
+    def close(self) -> None:
+        """Detach from the ring. The controller owns and removes the block."""
+        self._seq = self._time = self._valid = self._steps = None  # type: ignore[assignment]
+        self._values = {}
+        try:
+            self._shm.close()
+        except BufferError:
+            logger.warning(f"Views into live stream '{self.name}' are still in use; it stays mapped until they are released")
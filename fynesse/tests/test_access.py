@@ -7,9 +7,61 @@ This module tests data access functionality including:
 - Error handling for access issues
 """
 
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
 import pytest
 from fynesse import access
 
+SENSORS_JSON = os.path.join(
+    os.path.dirname(__file__), "..", "..", "robot", "controllers", "drive_robot", "sensors.json"
+)
+
+
+@pytest.fixture
+def session(tmp_path, monkeypatch):
+    """An empty session folder, with sensors.json where access.data() looks for it."""
+    config_dir = tmp_path / "robot" / "controllers" / "drive_robot"
+    config_dir.mkdir(parents=True)
+    shutil.copy(SENSORS_JSON, config_dir / "sensors.json")
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(access.frame_cache, "CACHE_DIR", str(tmp_path / "cache"))
+    folder = tmp_path / "session"
+    folder.mkdir()
+    return folder
+
+
+@pytest.fixture
+def make_session(session):
+    """
+    Builder filling the session folder with a reading every 16 ms for `rows` steps.
+
+    Sensors in `csv` are written as <name>.csv and sensors in `npy` as <name>.npy with
+    <name>_sim_time.npy. Value j of reading i is i * width + j, width being the sensor's
+    shape in sensors.json. `every` maps a sensor to keeping only every n-th step.
+    """
+    shapes = {sensor["name"]: sensor["shape"][0] for sensor in access.load_sensor_config()}
+
+    def build(rows, csv=(), npy=(), every=None):
+        every = every or {}
+        for name in (*csv, *npy):
+            times = (np.arange(1, rows + 1) * 0.016)[::every.get(name, 1)]
+            width = shapes[name]
+            values = np.arange(len(times) * width, dtype=np.float32).reshape(len(times), width)
+            if name in npy:
+                np.save(session / f"{name}.npy", values)
+                np.save(session / f"{name}_sim_time.npy", times)
+                continue
+            names = ["value"] if width == 1 else [f"value_{j}" for j in range(width)]
+            frame = pd.DataFrame(values, columns=names)
+            frame.insert(0, "sim_time", times)
+            frame.to_csv(session / f"{name}.csv", index=False)
+        return session
+
+    return build
+
 
 class TestAccessModule:
     """Test suite for the access module."""
@@ -72,3 +124,478 @@ class TestAccessErrorHandling:
         """Test handling of invalid or corrupted data sources."""
         # Template test - would test actual error handling in real implementation
         pass
+
+
+class TestAccessFormats:
+    """Test suite for the on-disk sensor formats access.data() reads."""
+
+    def test_typed_columns_preferred_over_csv(self, session) -> None:
+        """Test that <name>.npy columns are used instead of the CSV when both exist."""
+        times = np.array([0.016, 0.032, 0.048])
+        values = np.arange(9, dtype=np.float32).reshape(3, 3)
+        np.save(session / "gyro.npy", values)
+        np.save(session / "gyro_sim_time.npy", times)
+        pd.DataFrame({"sim_time": times, "value_0": 0.0, "value_1": 0.0, "value_2": 0.0}).to_csv(
+            session / "gyro.csv", index=False
+        )
+
+        df = access.data(str(session), sample_fraction=1.0)
+
+        assert df is not None
+        gyro = df[df["sensor"] == "gyro"].sort_values("sim_time")
+        np.testing.assert_array_equal(gyro["sim_time"].to_numpy(), times)
+        np.testing.assert_array_equal(gyro[["x", "y", "z"]].to_numpy(dtype=np.float32), values)
+
+    def test_single_value_csv_mapped_to_sensor_column(self, session) -> None:
+        """Test that a single-value sensor's `value` CSV column gets its csv_columns name."""
+        pd.DataFrame({"sim_time": [0.1, 0.2], "value": [3.0, 4.0]}).to_csv(session / "light.csv", index=False)
+
+        df = access.data(str(session), sample_fraction=1.0)
+
+        assert df is not None
+        assert sorted(df["light_intensity"].astype(float)) == [3.0, 4.0]
+
+    def test_compact_schema(self, session) -> None:
+        """Test that loaded frames use float64 sim_time, float32 values and a categorical sensor."""
+        pd.DataFrame({"sim_time": [0.1, 0.2], "value": [3.0, 4.0]}).to_csv(session / "light.csv", index=False)
+        pd.DataFrame({"sim_time": [0.1], "value_0": [1.0], "value_1": [2.0], "value_2": [3.0]}).to_csv(
+            session / "gps.csv", index=False
+        )
+
+        df = access.data(str(session), sample_fraction=1.0, workers=2)
+
+        assert df["sim_time"].dtype == np.float64
+        assert df["sensor"].dtype == "category"
+        assert set(df["sensor"]) == {"light", "gps"}
+        value_columns = df.columns.difference(["sim_time", "sensor"])
+        assert (df[value_columns].dtypes == np.float32).all()
+
+
+class TestAccessDegradation:
+    """Test suite for degradation profiles applied at load time."""
+
+    @pytest.fixture
+    def gyro_session(self, session):
+        times = np.arange(1, 201) * 0.016
+        values = np.random.default_rng(1).normal(size=(200, 3)).astype(np.float32)
+        np.save(session / "gyro.npy", values)
+        np.save(session / "gyro_sim_time.npy", times)
+        return session
+
+    def test_degradation_is_reproducible(self, gyro_session) -> None:
+        """Test that the same profile and seed give identical frames, and another seed does not."""
+        profile = dict(access.DEFAULT_DEGRADATION, salt_pepper_prob=0.05, drift_rate=0.01)
+        first = access.data(str(gyro_session), sample_fraction=1.0, degradation=profile, seed=3)
+        second = access.data(str(gyro_session), sample_fraction=1.0, degradation=profile, seed=3)
+        other = access.data(str(gyro_session), sample_fraction=1.0, degradation=profile, seed=4)
+
+        pd.testing.assert_frame_equal(first, second)
+        assert not first[["x", "y", "z"]].equals(other[["x", "y", "z"]])
+
+    def test_bias_and_latency(self, gyro_session) -> None:
+        """Test that bias shifts every value and latency keeps every n-th reading."""
+        clean = access.data(str(gyro_session), sample_fraction=1.0)
+        degraded = access.data(
+            str(gyro_session), sample_fraction=1.0, degradation={"bias": 1.0, "sensors": {"gyro": {"latency_rate": 4}}}
+        )
+
+        assert len(degraded) == 50
+        expected = clean[["x", "y", "z"]].to_numpy(dtype=float)[::4] + 1.0
+        np.testing.assert_allclose(degraded[["x", "y", "z"]].to_numpy(dtype=float), expected, rtol=1e-6)
+
+    def test_unknown_parameter_rejected(self, gyro_session) -> None:
+        """Test that a profile with an unknown parameter is reported and returns None."""
+        assert access.data(str(gyro_session), degradation={"gaussian_sd": 0.1}) is None
+
+
+class TestAccessDataset:
+    """Test suite for the per-sensor SensorDataset behind access.data()."""
+
+    @pytest.fixture
+    def two_sensor_session(self, session):
+        np.save(session / "gyro.npy", np.arange(12, dtype=np.float32).reshape(4, 3))
+        np.save(session / "gyro_sim_time.npy", np.array([0.016, 0.032, 0.048, 0.064]))
+        pd.DataFrame({"sim_time": [0.1, 0.2], "value": [3.0, 4.0]}).to_csv(session / "light.csv", index=False)
+        return session
+
+    def test_dense_blocks(self, two_sensor_session) -> None:
+        """Test that each sensor is a dense float32 block holding only its own columns."""
+        ds = access.dataset(str(two_sensor_session))
+
+        assert list(ds) == ["gyro", "light"]
+        gyro = ds["gyro"]
+        assert gyro.columns == ["x", "y", "z"]
+        assert gyro.values.dtype == np.float32 and gyro.values.flags["C_CONTIGUOUS"]
+        assert gyro.times.dtype == np.float64
+        assert not np.isnan(gyro.values).any()
+        assert list(ds["light"].frame()["light_intensity"]) == [3.0, 4.0]
+
+    def test_to_long_matches_data(self, two_sensor_session) -> None:
+        """Test that to_long() gives the frame access.data() returns, with fewer bytes held."""
+        ds = access.dataset(str(two_sensor_session))
+        df = access.data(str(two_sensor_session), sample_fraction=1.0)
+
+        pd.testing.assert_frame_equal(ds.to_long(), df)
+        assert list(df.columns[:4]) == ["sim_time", "x", "y", "z"]
+        assert df[df["sensor"] == "light"]["x"].isna().all()
+        assert ds.nbytes < df.memory_usage(deep=True).sum()
+
+
+class TestAccessCatalog:
+    """Test suite for the multi-session catalog and loader."""
+
+    @pytest.fixture
+    def root(self, session):
+        root = session.parent / "data"
+        for key, touch in (("noiseless/s1", 0.0), ("noiseless/s2", 2.5), ("noisy/wet/s2", 2.7)):
+            folder = root / key
+            folder.mkdir(parents=True)
+            times = np.arange(1, 11) * 0.016
+            pd.DataFrame({"sim_time": times, "value_0": 0.0, "value_1": touch, "value_2": 0.0}).to_csv(
+                folder / "touch.csv", index=False
+            )
+            pd.DataFrame({"sim_time": times[::2], "value": np.arange(5.0)}).to_csv(folder / "light.csv", index=False)
+        (root / "noisy" / "wet" / "s2" / "noise_profile.json").write_text(
+            '{"profile": "wet", "noise_params": {"gaussian_std": 0.1}}'
+        )
+        return root
+
+    def test_catalog_metadata(self, root) -> None:
+        """Test that the catalog records per-sensor statistics and the noise profile."""
+        cat = access.catalog(str(root))
+
+        assert sorted(cat["session"].unique()) == ["noiseless/s1", "noiseless/s2", "noisy/wet/s2"]
+        light = cat[(cat["session"] == "noiseless/s1") & (cat["sensor"] == "light")].iloc[0]
+        assert light["rows"] == 5 and light["max_light_intensity"] == 4.0
+        assert light["rate_hz"] == pytest.approx(31.25)
+        assert light["duration"] == pytest.approx(0.144)
+        assert cat[cat["session"] == "noisy/wet/s2"]["profile"].iloc[0] == "wet"
+        assert (root / "catalog.json").exists()
+
+    def test_catalog_reuses_unchanged_entries(self, root, monkeypatch) -> None:
+        """Test that a second call does not read unchanged sensor files."""
+        first = access.catalog(str(root))
+
+        def fail(*args):
+            raise AssertionError("sensor file read")
+
+        monkeypatch.setattr(access.session_catalog, "sensor_stats", fail)
+        pd.testing.assert_frame_equal(access.catalog(str(root)), first)
+
+    def test_load_selected_sessions(self, root) -> None:
+        """Test loading the sessions selected from the catalog into one frame with a session key."""
+        cat = access.catalog(str(root))
+        touched = cat[(cat["sensor"] == "touch") & (cat["max_y"] > 0)]
+
+        df = access.load_sessions(touched, root=str(root))
+
+        assert list(df["session"].cat.categories) == ["noiseless/s2", "noisy/wet/s2"]
+        assert df.groupby("session", observed=True).size().tolist() == [15, 15]
+        assert sorted(df.loc[df["sensor"] == "touch", "y"].unique()) == pytest.approx([2.5, 2.7])
+
+
+class TestAccessPushdown:
+    """Test suite for sensors=, columns= and time_range= pushed down to the file reads."""
+
+    @pytest.fixture
+    def long_session(self, make_session):
+        return make_session(1000, csv=["gyro", "light"], npy=["accelerometer"])
+
+    @pytest.mark.parametrize("time_range", [(4.0, 6.0), (0.0, 0.5), (15.9, 20.0), (4.096, 4.112)])
+    def test_time_range_matches_full_load(self, long_session, time_range) -> None:
+        """Test that a window read through the time index equals filtering a full load."""
+        full = access.data(str(long_session), sample_fraction=1.0)
+        window = access.data(str(long_session), sample_fraction=1.0, time_range=time_range)
+
+        t0, t1 = time_range
+        expected = full[(full["sim_time"] >= t0) & (full["sim_time"] <= t1)].reset_index(drop=True)
+        pd.testing.assert_frame_equal(window, expected)
+        assert sorted(os.listdir(long_session)) == sorted(
+            ["gyro.csv", "light.csv", "accelerometer.npy", "accelerometer_sim_time.npy"]
+        )
+        assert os.path.exists(access.time_index_path(str(long_session / "gyro.csv")))
+
+    def test_sensors_and_columns_projection(self, long_session) -> None:
+        """Test that only the selected sensors and columns are loaded."""
+        df = access.data(str(long_session), sample_fraction=1.0, sensors=["gyro", "accelerometer"], columns=["y"])
+
+        assert list(df.columns) == ["sim_time", "y", "sensor"]
+        assert list(df["sensor"].cat.categories) == ["gyro", "accelerometer"]
+        np.testing.assert_array_equal(df.loc[df["sensor"] == "gyro", "y"], np.arange(1, 3000, 3))
+
+    def test_index_rebuilt_when_file_changes(self, long_session) -> None:
+        """Test that a stale time index is not used after the CSV is rewritten."""
+        access.data(str(long_session), sample_fraction=1.0, sensors=["light"], time_range=(0, 1))
+        access.sensor_reader._TIME_INDEXES.clear()
+        pd.DataFrame({"sim_time": [0.5, 1.5], "value": [7.0, 8.0]}).to_csv(long_session / "light.csv", index=False)
+
+        df = access.data(str(long_session), sample_fraction=1.0, sensors=["light"], time_range=(1, 2))
+
+        assert df["light_intensity"].tolist() == [8.0]
+
+    @pytest.mark.parametrize("selection", [
+        {},
+        {"sensors": ["gyro", "light"], "columns": ["y"]},
+        {"sensors": ["gyro"], "time_range": (4.0, 6.0)},
+    ])
+    def test_pyarrow_engine_matches_c_parser(self, long_session, monkeypatch, selection) -> None:
+        """Test that CSVs read by pyarrow get the C parser's dtypes, categories and column pushdown."""
+        pytest.importorskip("pyarrow")
+        monkeypatch.setattr(access.sensor_reader, "CSV_ENGINE", "c")
+        expected = access.data(str(long_session), sample_fraction=1.0, cache=False, **selection)
+        monkeypatch.setattr(access.sensor_reader, "CSV_ENGINE", "pyarrow")
+
+        df = access.data(str(long_session), sample_fraction=1.0, cache=False, **selection)
+
+        pd.testing.assert_frame_equal(df, expected)
+
+    def test_unknown_selection_rejected(self, long_session) -> None:
+        """Test that unknown sensor or column names are reported and return None."""
+        assert access.data(str(long_session), sensors=["sonar"]) is None
+        assert access.data(str(long_session), sensors=["light"], columns=["x"]) is None
+
+
+class TestAccessCache:
+    """Test suite for the on-disk frame cache."""
+
+    def test_frame_round_trip_is_memory_mapped(self, tmp_path) -> None:
+        """Test that save_frame/load_frame keep dtypes, categories and index, memory-mapped."""
+        df = pd.DataFrame({
+            "sim_time": [0.016, 0.032, 0.048],
+            "x": np.array([1, 2, 3], dtype=np.float32),
+            "y": np.array([4, np.nan, 6], dtype=np.float32),
+            "sensor": pd.Categorical(["gyro", "light", "gyro"]),
+        }).set_index("sim_time", drop=False)
+
+        access.save_frame(df, str(tmp_path / "entry"))
+        loaded = access.load_frame(str(tmp_path / "entry"))
+
+        pd.testing.assert_frame_equal(loaded, df)
+        base = loaded["x"].to_numpy()
+        while base is not None and not isinstance(base, np.memmap):
+            base = base.base
+        assert base is not None
+        loaded.loc[0.016, "x"] = 9.0
+        assert access.load_frame(str(tmp_path / "entry"))["x"].iloc[0] == 1.0
+
+    def test_hit_skips_loading_until_sources_change(self, session, monkeypatch) -> None:
+        """Test that an unchanged session is served from the cache and a changed one reloaded."""
+        pd.DataFrame({"sim_time": [0.1, 0.2], "value": [3.0, 4.0]}).to_csv(session / "light.csv", index=False)
+        first = access.data(str(session), sample_fraction=1.0, cache=True)
+        dataset = access.dataset
+
+        def fail(*args, **kwargs):
+            raise AssertionError("session reloaded")
+
+        monkeypatch.setattr(access, "dataset", fail)
+        pd.testing.assert_frame_equal(access.data(str(session), sample_fraction=1.0, cache=True), first)
+
+        monkeypatch.setattr(access, "dataset", dataset)
+        pd.DataFrame({"sim_time": [0.1], "value": [5.0]}).to_csv(session / "light.csv", index=False)
+        assert access.data(str(session), sample_fraction=1.0, cache=True)["light_intensity"].tolist() == [5.0]
+
+    def test_least_recently_used_evicted(self, tmp_path) -> None:
+        """Test that eviction removes the entries used longest ago until the budget is met."""
+        df = pd.DataFrame({"x": np.zeros(1000, dtype=np.float32)})
+        for key in ("a", "b", "c"):
+            access.cache_put(key, df, cache_dir=str(tmp_path))
+            os.utime(tmp_path / key / "meta.json", (0, {"a": 1, "b": 3, "c": 2}[key]))
+
+        removed = access.evict_cache(str(tmp_path), max_bytes=2 * 4500)
+
+        assert removed == ["a"]
+        assert sorted(os.listdir(tmp_path)) == ["b", "c"]
+
+
+class TestAccessExport:
+    """Test suite for opt-in export sinks."""
+
+    @pytest.fixture
+    def light_session(self, session):
+        pd.DataFrame({"sim_time": [0.1, 0.2], "value": [3.0, 4.0]}).to_csv(session / "light.csv", index=False)
+        return session
+
+    def test_no_files_written_by_default(self, light_session) -> None:
+        """Test that loading writes nothing into the working directory."""
+        before = set(os.listdir("."))
+        access.data(str(light_session), sample_fraction=1.0, cache=False)
+        access.flush_exports()
+
+        assert set(os.listdir(".")) == before
+
+    def test_sink_must_implement_write(self) -> None:
+        """Test that ExportSink is abstract and a subclass without write() cannot be created."""
+        class NoWrite(access.ExportSink):
+            pass
+
+        with pytest.raises(TypeError):
+            access.ExportSink()
+        with pytest.raises(TypeError):
+            NoWrite()
+
+    def test_csv_and_binary_sinks(self, light_session, tmp_path) -> None:
+        """Test that the requested sinks get the loaded frame once the exports are flushed."""
+        df = access.data(
+            str(light_session), sample_fraction=1.0, cache=False,
+            export_to=[access.CSVSink(str(tmp_path / "out")), access.BinarySink(str(tmp_path / "out"))],
+        )
+        assert access.flush_exports() == []
+
+        assert pd.read_csv(tmp_path / "out" / "x.csv")["light_intensity"].tolist() == [3.0, 4.0]
+        pd.testing.assert_frame_equal(access.load_frame(str(tmp_path / "out" / "x")), df)
+
+    def test_artifact_runs_do_not_clobber(self, light_session, tmp_path) -> None:
+        """Test that two runs exporting the same name get separate folders."""
+        first, second = access.ArtifactSink(str(tmp_path / "runs")), access.ArtifactSink(str(tmp_path / "runs"))
+        access.data(str(light_session), sample_fraction=1.0, cache=False, export_to=first)
+        access.data(str(light_session), sample_fraction=1.0, cache=False, export_to=second)
+        access.flush_exports()
+
+        assert first.folder != second.folder
+        assert os.path.exists(os.path.join(first.folder, "x.csv"))
+        assert os.path.exists(os.path.join(second.folder, "x.csv"))
+
+
+class TestAccessSampling:
+    """Test suite for seeded sampling applied while reading."""
+
+    @pytest.fixture
+    def long_session(self, make_session):
+        return make_session(3000, csv=["gyro"], npy=["imu"])
+
+    @pytest.mark.parametrize("sampling", ["blocks", "rows"])
+    def test_same_seed_same_frame(self, long_session, sampling) -> None:
+        """Test that a seed always selects the same readings and another seed does not."""
+        first = access.data(str(long_session), 0.5, seed=7, sampling=sampling, cache=False)
+        second = access.data(str(long_session), 0.5, seed=7, sampling=sampling, cache=False)
+        other = access.data(str(long_session), 0.5, seed=8, sampling=sampling, cache=False)
+
+        pd.testing.assert_frame_equal(first, second)
+        assert not first["sim_time"].equals(other["sim_time"])
+        assert len(first) == pytest.approx(3000, rel=0.1)
+
+    def test_blocks_are_contiguous_and_shared(self, long_session) -> None:
+        """Test that block sampling keeps whole time blocks, the same ones for every sensor."""
+        df = access.data(str(long_session), 0.4, block_duration=2.0, cache=False)
+
+        gyro = df.loc[df["sensor"] == "gyro", "sim_time"].to_numpy()
+        imu = df.loc[df["sensor"] == "imu", "sim_time"].to_numpy()
+        np.testing.assert_allclose(gyro, imu, rtol=0, atol=1e-9)
+        blocks = np.unique(np.floor(gyro / 2.0))
+        assert len(blocks) == 10
+        assert len(gyro) == sum(
+            ((np.arange(1, 3001) * 0.016 >= 2 * b) & (np.arange(1, 3001) * 0.016 < 2 * (b + 1))).sum() for b in blocks
+        )
+
+    def test_row_sampling_falls_back_to_c_parser(self, long_session, monkeypatch) -> None:
+        """Test that row sampling of CSVs gives the same rows when pyarrow is the configured engine."""
+        expected = access.data(str(long_session), 0.5, sensors=["gyro"], sampling="rows", cache=False)
+        monkeypatch.setattr(access.sensor_reader, "CSV_ENGINE", "pyarrow")
+
+        df = access.data(str(long_session), 0.5, sensors=["gyro"], sampling="rows", cache=False)
+
+        pd.testing.assert_frame_equal(df, expected)
+
+    def test_sample_blocks_within_time_range(self) -> None:
+        """Test that sampled blocks are clipped to the time range and merged when adjacent."""
+        ranges = access.sample_blocks(0.0, 100.0, 1.0, 5.0, seed=0, time_range=(12.0, 31.0))
+
+        assert len(ranges) == 1
+        assert ranges[0][0] == 12.0 and ranges[0][1] == 31.0
+
+
+class TestAccessFrames:
+    """Test suite for memory-mapped lidar and depth frames."""
+
+    @pytest.fixture
+    def frame_session(self, session):
+        times = np.arange(1, 101) * 0.032
+        lidar = np.arange(100 * 2048 * 3, dtype=np.float32).reshape(100, 2048, 3)
+        np.save(session / "lidar.npy", lidar)
+        np.save(session / "lidar_sim_time.npy", times)
+        pd.DataFrame({"sim_time": times, "value": 1.0}).to_csv(session / "light.csv", index=False)
+        return session
+
+    def test_frames_are_memory_mapped(self, frame_session) -> None:
+        """Test that frames map the file with their sim_time index instead of reading it."""
+        lidar = access.frames(str(frame_session), "lidar")
+
+        assert lidar.shape == (100, 2048, 3)
+        assert lidar.kind == "point_cloud"
+        assert isinstance(lidar.values, np.memmap)
+        np.testing.assert_array_equal(lidar[3], np.load(frame_session / "lidar.npy")[3])
+
+    def test_between_and_at(self, frame_session) -> None:
+        """Test slicing frames by sim_time without copying, and the latest frame lookup."""
+        lidar = access.frames(str(frame_session), "lidar")
+
+        window = lidar.between(0.32, 0.64)
+        assert len(window) == 11
+        assert np.shares_memory(window.values, lidar.values)
+        t, frame = lidar.at(0.1)
+        assert t == pytest.approx(0.096)
+        np.testing.assert_array_equal(frame, lidar[2])
+        with pytest.raises(IndexError):
+            lidar.at(0.0)
+        assert sum(len(times) for times, _ in lidar.batches(30)) == 100
+
+    def test_shape_mismatch_rejected(self, session) -> None:
+        """Test that a frame file whose shape disagrees with sensors.json is not mapped."""
+        np.save(session / "lidar.npy", np.zeros((4, 10, 3), dtype=np.float32))
+        np.save(session / "lidar_sim_time.npy", np.arange(4) * 0.032)
+
+        assert access.frames(str(session), "lidar") is None
+
+    def test_dataset_pairs_frames(self, frame_session) -> None:
+        """Test that dataset() maps frame sensors next to the low-dimensional blocks."""
+        ds = access.dataset(str(frame_session), sensors=["light", "lidar"], time_range=(1.0, 2.0))
+
+        assert list(ds) == ["light"]
+        assert list(ds.frames) == ["lidar"]
+        assert ds.frames["lidar"].times.min() >= 1.0 and ds.frames["lidar"].times.max() <= 2.0
+        assert access.dataset(str(frame_session), sensors=["light"]).frames == {}
+
+
+class TestAccessStreaming:
+    """Test suite for reading sessions in time-ordered chunks."""
+
+    @pytest.fixture
+    def long_session(self, make_session):
+        return make_session(3000, csv=["gyro"], npy=["light"], every={"light": 3})
+
+    @pytest.mark.parametrize("sample_fraction", [1.0, 0.5])
+    def test_chunks_cover_data(self, long_session, sample_fraction) -> None:
+        """Test that chunks are time-ordered, disjoint, share a schema and add up to data()."""
+        chunks = list(access.iter_data(str(long_session), chunk_duration=3.0, sample_fraction=sample_fraction))
+        full = access.data(str(long_session), sample_fraction, cache=False)
+
+        assert len(chunks) > 1
+        for before, after in zip(chunks, chunks[1:]):
+            assert before["sim_time"].max() < after["sim_time"].min()
+            pd.testing.assert_series_equal(before.dtypes, after.dtypes)
+        combined = pd.concat(chunks, ignore_index=True).sort_values(["sensor", "sim_time"], ignore_index=True)
+        pd.testing.assert_frame_equal(combined, full.sort_values(["sensor", "sim_time"], ignore_index=True))
+
+    def test_chunk_ranges_partition_time(self) -> None:
+        """Test that chunks lie on the chunk grid, clipped to the time range, and never overlap."""
+        chunks = access.chunk_ranges(1.0, 9.5, 4.0, time_range=(2.0, 20.0))
+
+        assert [t0 for t0, _ in chunks] == [2.0, 4.0, 8.0]
+        assert 9.5 < chunks[-1][1] < 12.0
+        assert all(t1 < next_t0 for (_, t1), (next_t0, _) in zip(chunks, chunks[1:]))
+
+    def test_chunks_hold_frame_views(self, session) -> None:
+        """Test that each chunk maps only its own lidar frames."""
+        times = np.arange(1, 101) * 0.032
+        np.save(session / "lidar.npy", np.zeros((100, 2048, 3), dtype=np.float32))
+        np.save(session / "lidar_sim_time.npy", times)
+
+        chunks = list(access.iter_dataset(str(session), chunk_duration=1.0, sensors=["lidar"]))
+
+        assert [len(chunk.frames["lidar"]) for chunk in chunks] == [31, 31, 31, 7]
+        assert all(isinstance(chunk.frames["lidar"].values, np.memmap) for chunk in chunks)
+        assert all(len(chunk) == 0 for chunk in chunks)
+
+    def test_invalid_chunk_duration(self, long_session) -> None:
+        """Test that a non-positive chunk_duration yields nothing."""
+        assert list(access.iter_data(str(long_session), chunk_duration=0.0)) == []
@@ -8,6 +8,8 @@ This module tests question addressing functionality including:
 - Dashboard creation
 """
 
+import numpy as np
+import pandas as pd
 import pytest
 from fynesse import address
 
@@ -131,3 +133,28 @@ class TestAddressIntegration:
         """Test communication of results to stakeholders."""
         # Template test - would test actual result communication in real implementation
         pass
+
+
+class TestAddressStreaming:
+    """Test suite for statistics computed from a stream of chunks."""
+
+    def test_stream_statistics_match_whole_frame(self) -> None:
+        """Test that statistics merged across chunks equal those of the whole frame."""
+        rng = np.random.default_rng(0)
+        df = pd.DataFrame({
+            "sim_time": np.arange(300) * 0.016,
+            "x": rng.normal(5.0, 2.0, 300),
+            "y": np.where(np.arange(300) % 2, np.nan, rng.normal(size=300)),
+            "sensor": np.repeat(["gyro", "imu", "gyro"], 100),
+        })
+
+        stats = address.stream_statistics([df.iloc[:70], df.iloc[70:71], df.iloc[71:]]).set_index("column")
+        by_sensor = address.stream_statistics([df.iloc[:150], df.iloc[150:]], by_sensor=True)
+
+        for col in ["sim_time", "x", "y"]:
+            assert stats.loc[col, "count"] == df[col].count()
+            assert stats.loc[col, "mean"] == pytest.approx(df[col].mean())
+            assert stats.loc[col, "std"] == pytest.approx(df[col].std())
+            assert stats.loc[col, "min"] == df[col].min() and stats.loc[col, "max"] == df[col].max()
+        gyro_x = by_sensor[(by_sensor["sensor"] == "gyro") & (by_sensor["column"] == "x")].iloc[0]
+        assert gyro_x["std"] == pytest.approx(df.loc[df["sensor"] == "gyro", "x"].std())
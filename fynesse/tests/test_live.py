@@ -0,0 +1,116 @@
+"""
+Tests for the live module of the fynesse framework.
+
+This module tests reading a controller's shared-memory step stream, using the
+controller's own publisher.
+"""
+
+import os
+import sys
+import uuid
+
+import numpy as np
+import pytest
+
+from fynesse import live
+
+CONTROLLER_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "robot", "controllers", "drive_robot")
+sys.path.insert(0, CONTROLLER_DIR)
+from step_stream import StepPublisher  # noqa: E402
+
+SENSORS = [
+    {"name": "gyro", "shape": [3], "csv_columns": ["x", "y", "z"]},
+    {"name": "light", "shape": [1], "csv_columns": ["light_intensity"]},
+]
+
+
+@pytest.fixture
+def publisher():
+    pub = StepPublisher(f"fynesse_test_{uuid.uuid4().hex[:8]}", SENSORS, capacity=8)
+    yield pub
+    pub.close()
+
+
+class TestStepStream:
+    """Test suite for the live step stream reader."""
+
+    def test_reads_published_steps(self, publisher) -> None:
+        """Test that published steps come back in order with their values."""
+        stream = live.StepStream(publisher.name)
+        for i in range(5):
+            readings = {"gyro": [i, i + 1, i + 2]}
+            if i % 2 == 0:
+                readings["light"] = 10.0 * i
+            publisher.publish(0.016 * (i + 1), readings)
+
+        steps = [
+            (step, sim_time, {name: values.copy() for name, values in readings.items()})
+            for step, sim_time, readings in stream.iter_steps(start=0, timeout=0.0)
+        ]
+        stream.close()
+
+        assert [s[0] for s in steps] == [0, 1, 2, 3, 4]
+        assert steps[3][1] == pytest.approx(0.064)
+        np.testing.assert_array_equal(steps[3][2]["gyro"], [3, 4, 5])
+        assert "light" not in steps[3][2]
+        assert steps[4][2]["light"][0] == pytest.approx(40.0)
+
+    def test_reader_skips_lapped_steps(self, publisher) -> None:
+        """Test that a reader that falls behind the ring counts missed steps."""
+        stream = live.StepStream(publisher.name)
+        for i in range(20):
+            publisher.publish(0.016 * (i + 1), {"gyro": [i, 0, 0]})
+
+        steps = [step for step, _, _ in stream.iter_steps(start=0, timeout=0.0)]
+        stream.close()
+
+        assert steps == list(range(12, 20))
+        assert stream.missed == 12
+
+    def test_frames_match_access_format(self, publisher) -> None:
+        """Test that frames use the access.data long format."""
+        stream = live.StepStream(publisher.name)
+        for i in range(4):
+            publisher.publish(0.016 * (i + 1), {"gyro": [i, 0, 0], "light": 1.0})
+
+        frames = list(stream.iter_frames(batch_steps=4, start=0, timeout=0.0))
+        stream.close()
+
+        assert len(frames) == 1
+        df = frames[0]
+        assert set(df.columns) == {"sim_time", "x", "y", "z", "light_intensity", "sensor"}
+        assert (df["sensor"] == "gyro").sum() == 4
+
+    def test_step_lapped_while_copied_is_dropped(self, publisher) -> None:
+        """Test that a step overwritten while it is being copied counts as missed, not torn."""
+        stream = live.StepStream(publisher.name)
+        publisher.publish(0.016, {"gyro": [0, 0, 0]})
+
+        class LapOnRead:
+            # Lets the publisher lap the whole ring in the middle of the first read
+            def __init__(self, values):
+                self.values = values
+                self.lapped = False
+
+            def __getitem__(self, slot):
+                values = self.values[slot]
+                if not self.lapped:
+                    self.lapped = True
+                    for i in range(1, 9):
+                        publisher.publish(0.016 * (i + 1), {"gyro": [i, 0, 0]})
+                return values
+
+        stream._values["gyro"] = LapOnRead(stream._values["gyro"])
+        frames = list(stream.iter_frames(batch_steps=16, start=0, timeout=0.0))
+        stream._values["gyro"].values = None
+        stream.close()
+
+        df = frames[0]
+        assert stream.missed == 1
+        np.testing.assert_allclose(df["sim_time"], 0.016 * np.arange(2, 10))
+        np.testing.assert_array_equal(df["x"], np.arange(1, 9))
+
+    def test_missing_stream_raises(self) -> None:
+        """Test that attaching to a stream that does not exist fails clearly."""
+        with pytest.raises(FileNotFoundError):
+            live.StepStream(f"fynesse_missing_{uuid.uuid4().hex[:8]}")
@@ -0,0 +1,118 @@
+"""
+Benchmark the drive_robot logging pipeline without Webots.
+
+Runs drive_robot.main() against the headless stand-in Robot in this folder and
+reports steps/sec, per-step controller latency percentiles, logger queue depth and
+peak RSS. Run from the repository root, e.g.
+
+    python robot/controllers/drive_robot/headless/bench.py --steps 5000 --rate 62.5
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import resource
+import contextlib
+import numpy as np
+
+HEADLESS_DIR = os.path.dirname(os.path.abspath(__file__))
+# The stand-in controller module must shadow any real Webots installation
+sys.path.insert(0, HEADLESS_DIR)
+sys.path.insert(1, os.path.join(HEADLESS_DIR, ".."))
+from controller import Robot  # noqa: E402
+import drive_robot  # noqa: E402
+
+
+def peak_rss_mb():
+    # ru_maxrss is reported in kilobytes on Linux and bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def run_benchmark(steps=2000, step_rate=0.0, timestep=16, data_root=None, quiet=True):
+    """
+    Run the controller loop for a fixed number of steps and collect metrics.
+
+    Args:
+        steps (int): Number of simulation steps.
+        step_rate (float): Wall-clock steps per second to pace to; 0 runs flat out.
+        timestep (int): Basic time step in milliseconds.
+        data_root (str, optional): Where session data is written. A temporary folder
+            that is removed afterwards is used when not given.
+        quiet (bool): Discard the controller's console output.
+
+    Returns:
+        dict: Benchmark results.
+    """
+    robot = Robot(basic_time_step=timestep, max_steps=steps, step_rate=step_rate)
+    queue_depths = np.zeros(steps, dtype=np.int64)
+
+    def on_step(sensor_logger):
+        queue_depths[robot.steps - 1] = sensor_logger.queue_depth()
+
+    cleanup = data_root is None
+    if cleanup:
+        data_root = tempfile.mkdtemp(prefix="drive_robot_bench_")
+    try:
+        with open(os.devnull, "w") as devnull:
+            redirect = contextlib.redirect_stdout(devnull) if quiet else contextlib.nullcontext()
+            start = time.perf_counter()
+            with redirect:
+                sensor_logger = drive_robot.main(robot=robot, data_root=data_root, on_step=on_step)
+            elapsed = time.perf_counter() - start
+        bytes_on_disk = sum(
+            os.path.getsize(os.path.join(dirpath, name))
+            for dirpath, _, names in os.walk(data_root) for name in names
+        )
+    finally:
+        if cleanup:
+            shutil.rmtree(data_root, ignore_errors=True)
+
+    latencies_ms = robot.step_latencies[:robot.steps] * 1e3
+    return {
+        "steps": robot.steps,
+        "elapsed_s": elapsed,
+        "steps_per_sec": robot.steps / elapsed if elapsed > 0 else 0.0,
+        "latency_ms": {
+            "p50": float(np.percentile(latencies_ms, 50)),
+            "p90": float(np.percentile(latencies_ms, 90)),
+            "p99": float(np.percentile(latencies_ms, 99)),
+            "max": float(latencies_ms.max()),
+        },
+        "queue_depth": {"mean": float(queue_depths.mean()), "max": int(queue_depths.max())},
+        "dropped_steps": sensor_logger.dropped_steps,
+        "enqueue_us": sensor_logger.enqueue_stats(),
+        "bytes_written": bytes_on_disk,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def print_report(results):
+    lat = results["latency_ms"]
+    enq = results["enqueue_us"]
+    print(f"Steps: {results['steps']} in {results['elapsed_s']:.2f} s -> {results['steps_per_sec']:.1f} steps/s")
+    print(f"Per-step latency (ms): p50={lat['p50']:.3f} p90={lat['p90']:.3f} p99={lat['p99']:.3f} max={lat['max']:.3f}")
+    print(f"Enqueue cost (us): mean={enq['mean_us']:.1f} p99={enq['p99_us']:.1f} max={enq['max_us']:.1f}")
+    print(f"Queue depth: mean={results['queue_depth']['mean']:.1f} max={results['queue_depth']['max']}")
+    print(f"Dropped steps: {results['dropped_steps']}")
+    print(f"Bytes written: {results['bytes_written'] / 1e6:.1f} MB")
+    print(f"Peak RSS: {results['peak_rss_mb']:.1f} MB")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the drive_robot logging loop headlessly.")
+    parser.add_argument("--steps", type=int, default=2000, help="Number of simulation steps")
+    parser.add_argument("--rate", type=float, default=0.0, help="Steps per second to pace to (0 = flat out)")
+    parser.add_argument("--timestep", type=int, default=16, help="Basic time step in milliseconds")
+    parser.add_argument("--data-root", default=None, help="Keep the recorded session in this folder")
+    parser.add_argument("--json", default=None, help="Also write the results to this JSON file")
+    args = parser.parse_args()
+
+    results = run_benchmark(args.steps, args.rate, args.timestep, args.data_root)
+    print_report(results)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
@@ -0,0 +1,238 @@
+"""
+Headless stand-in for the Webots `controller` module.
+
+Provides just enough of Robot and its devices for drive_robot.py to run outside
+Webots. Sensors return synthetic readings with the shapes declared in sensors.json,
+and Robot.step() can pace itself to a fixed step rate. Put this folder first on
+sys.path (bench.py does) so `from controller import Robot, ...` resolves here.
+"""
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from sensor_log import load_sensors, LIDAR_POINT_FIELDS  # noqa: E402
+
+# Number of distinct synthetic readings cycled through per device
+POOL_SIZE = 16
+
+
+class Device:
+    def __init__(self, name, shape, rng):
+        self.name = name
+        self.shape = tuple(shape)
+        self.sampling_period = 0
+        self._pool = rng.normal(size=(POOL_SIZE,) + self.shape).astype(np.float32)
+        # Webots returns plain Python lists for vector readings; frame devices serve buffers
+        self._lists = [row.reshape(-1).tolist() for row in self._pool] if self._pool[0].size <= 16 else None
+        self._robot = None
+
+    def enable(self, sampling_period):
+        self.sampling_period = sampling_period
+
+    def disable(self):
+        self.sampling_period = 0
+
+    def _index(self):
+        return self._robot.steps % POOL_SIZE
+
+    def getValues(self):
+        return self._lists[self._index()]
+
+    def getValue(self):
+        return self._lists[self._index()][0]
+
+
+class Accelerometer(Device):
+    pass
+
+
+class Compass(Device):
+    pass
+
+
+class GPS(Device):
+    pass
+
+
+class Gyro(Device):
+    pass
+
+
+class InertialUnit(Device):
+    def getRollPitchYaw(self):
+        return self.getValues()
+
+
+class LightSensor(Device):
+    pass
+
+
+class DistanceSensor(Device):
+    pass
+
+
+class PositionSensor(Device):
+    pass
+
+
+class TouchSensor(Device):
+    BUMPER = 0
+    FORCE = 1
+    FORCE3D = 2
+
+    def getType(self):
+        return TouchSensor.FORCE3D if self.shape == (3,) else TouchSensor.FORCE
+
+
+class Lidar(Device):
+    def __init__(self, name, shape, rng):
+        super().__init__(name, shape, rng)
+        # Packed LidarPoint structs, as returned by getPointCloud(data_type="buffer")
+        points = np.zeros((POOL_SIZE, shape[0], LIDAR_POINT_FIELDS), dtype=np.float32)
+        points[:, :, :3] = self._pool
+        self._buffers = [frame.tobytes() for frame in points]
+
+    def enablePointCloud(self):
+        pass
+
+    def getPointCloud(self, data_type="list"):
+        if data_type != "buffer":
+            raise NotImplementedError("The headless lidar only serves the buffer point cloud")
+        return self._buffers[self._index()]
+
+
+class RangeFinder(Device):
+    def __init__(self, name, shape, rng):
+        super().__init__(name, shape, rng)
+        self._buffers = [np.abs(frame).tobytes() for frame in self._pool]
+
+    def getRangeImage(self, data_type="list"):
+        if data_type != "buffer":
+            raise NotImplementedError("The headless range finder only serves the buffer range image")
+        return self._buffers[self._index()]
+
+
+class Camera:
+    def __init__(self, name):
+        self.name = name
+
+    def enable(self, sampling_period):
+        pass
+
+
+class Motor:
+    def __init__(self, name):
+        self.name = name
+        self.velocity = 0.0
+
+    def setPosition(self, position):
+        pass
+
+    def setVelocity(self, velocity):
+        self.velocity = velocity
+
+
+class Keyboard:
+    UP = 315
+    DOWN = 317
+    LEFT = 314
+    RIGHT = 316
+
+    # Scripted driving: forward, turn left, forward, turn right, idle
+    SCRIPT = [ord('W')] * 100 + [ord('A')] * 25 + [ord('W')] * 100 + [ord('D')] * 25 + [-1] * 50
+
+    def __init__(self):
+        self._robot = None
+
+    def enable(self, sampling_period):
+        pass
+
+    def getKey(self):
+        return self.SCRIPT[self._robot.steps % len(self.SCRIPT)]
+
+
+# Webots device name -> (device class, sensors.json entry)
+DEVICES = {
+    "accelerometer": (Accelerometer, "accelerometer"),
+    "compass": (Compass, "compass"),
+    "lidar": (Lidar, "lidar"),
+    "gps": (GPS, "gps"),
+    "gyro": (Gyro, "gyro"),
+    "imu": (InertialUnit, "imu"),
+    "light sensor": (LightSensor, "light"),
+    "touch sensor": (TouchSensor, "touch"),
+    "distance sensor": (DistanceSensor, "distance"),
+    "position_sensor_1": (PositionSensor, "position_1"),
+    "position_sensor_2": (PositionSensor, "position_2"),
+    "Astra depth": (RangeFinder, "depth"),
+}
+
+
+class Robot:
+    """
+    Stand-in Robot that steps a fake clock.
+
+    Args:
+        basic_time_step (int, optional): Simulated step in milliseconds. Defaults to 16.
+        max_steps (int, optional): step() returns -1 after this many steps. Defaults to 1000.
+        step_rate (float, optional): Wall-clock steps per second to pace to; 0 runs
+            as fast as the controller allows.
+        seed (int, optional): Seed for the synthetic readings.
+    """
+
+    def __init__(self, basic_time_step=16, max_steps=1000, step_rate=0.0, seed=0):
+        self.basic_time_step = basic_time_step
+        self.max_steps = max_steps
+        self.step_rate = step_rate
+        self.steps = 0
+        # Wall-clock time the controller spent between step() calls
+        self.step_latencies = np.zeros(max_steps, dtype=np.float64)
+        self._last_return = None
+        self._next_deadline = None
+        rng = np.random.default_rng(seed)
+        shapes = {s["name"]: s["shape"] for s in load_sensors()}
+        self._devices = {}
+        for name, (cls, sensor) in DEVICES.items():
+            self._devices[name] = self._attach(cls(name, shapes[sensor], rng))
+        self._keyboard = self._attach(Keyboard())
+
+    def _attach(self, device):
+        device._robot = self
+        return device
+
+    def getBasicTimeStep(self):
+        return float(self.basic_time_step)
+
+    def getTime(self):
+        return self.steps * self.basic_time_step / 1000.0
+
+    def getDevice(self, name):
+        if name in self._devices:
+            return self._devices[name]
+        if name.startswith("motor"):
+            return self._devices.setdefault(name, Motor(name))
+        if name.startswith("Astra"):
+            return self._devices.setdefault(name, Camera(name))
+        raise KeyError(f"Unknown device {name}")
+
+    def getKeyboard(self):
+        return self._keyboard
+
+    def step(self, duration):
+        now = time.perf_counter()
+        if self._last_return is not None:
+            self.step_latencies[self.steps - 1] = now - self._last_return
+        if self.steps >= self.max_steps:
+            return -1
+        if self.step_rate > 0:
+            if self._next_deadline is None:
+                self._next_deadline = now
+            self._next_deadline += 1.0 / self.step_rate
+            delay = self._next_deadline - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        self.steps += 1
+        self._last_return = time.perf_counter()
+        return 0
@@ -1,73 +1,129 @@
-import pickle
 import os
 import argparse
-from datetime import datetime
 import numpy as np
+from sensor_log import is_log_file, chunk_index, read_rows, read_range, read_legacy_pickle, summarize
 
-def read_pickle_data(pickle_file, n):
+def print_rows(times, values):
     """
-    Read the first n elements from a pickle file and print them, handling variable number of columns.
-    
+    Print (sim_time, values) rows with one column per value.
+    """
+    values = values.reshape(len(times), -1)
+    num_columns = values.shape[1]
+    if num_columns == 1:
+        header = "Simulation Time | Value"
+    else:
+        header = "Simulation Time | " + " | ".join(f"Col_{i+1}" for i in range(num_columns))
+    print(header)
+    print("-" * (len(header) + 10))
+    for sim_time, row in zip(times, values):
+        print(f"{sim_time:.3f} s | {' | '.join(f'{val:.3f}' for val in row)}")
+
+def print_summary(log_file):
+    """
+    Print rows, sim_time span, rate and value range of a sensor log from its index.
+    """
+    s = summarize(log_file)
+    name = os.path.basename(log_file)
+    if s["rows"] == 0:
+        print(f"{name}: no data")
+        return
+    low = ", ".join(f"{v:.3f}" for v in s["min"])
+    high = ", ".join(f"{v:.3f}" for v in s["max"])
+    print(
+        f"{name}: {s['rows']} rows in {s['chunks']} chunks, {s['t_first']:.3f}-{s['t_last']:.3f} s "
+        f"({s['rate_hz']:.1f} Hz), shape {tuple(s['shape'])}, {s['bytes'] / 1e6:.2f} MB | "
+        f"min [{low}] max [{high}] ({s['source']})"
+    )
+
+def read_sensor_file(data_file, head=None, tail=None, between=None, summary=False):
+    """
+    Peek into a recorded sensor file. For chunked logs (.bin) only the chunks holding
+    the requested rows are read, using the chunk index.
+
     Args:
-        pickle_file (str): Path to the pickle file
-        n (int): Number of elements to print
+        data_file (str): Path to a .bin sensor log or a legacy .pkl file
+        head (int, optional): Print the first `head` readings
+        tail (int, optional): Print the last `tail` readings
+        between (tuple, optional): Print the readings with t0 <= sim_time <= t1
+        summary (bool): Print the summary line instead of readings
     """
-    if not os.path.exists(pickle_file):
-        print(f"Error: Pickle file '{pickle_file}' does not exist.")
+    if not os.path.exists(data_file):
+        print(f"Error: Sensor file '{data_file}' does not exist.")
         return
-    
+
     try:
-        with open(pickle_file, 'rb') as f:
-            data = pickle.load(f)
-        
-        # Ensure n does not exceed the length of data
-        n = min(n, len(data))
-        
-        if n == 0:
-            print("No data available in the pickle file.")
-            return
-        
-        # Determine the number of columns dynamically
-        first_data = data[0][1]  # Access the sensor data part of the first tuple
-        num_columns = len(first_data) if isinstance(first_data, (list, tuple, np.ndarray)) else 1
-        
-        # Create header based on number of columns
-        if num_columns == 1:
-            header = "Simulation Time | Value"
-            column_names = ["Value"]
+        name = os.path.basename(data_file)
+        if is_log_file(data_file):
+            if summary:
+                print_summary(data_file)
+                return
+            index = chunk_index(data_file)
+            if between is not None:
+                times, values = read_range(data_file, between[0], between[1], index)
+                label = f"readings between {between[0]:.3f} and {between[1]:.3f} s"
+            elif tail is not None:
+                # read_rows(-0) would be the whole file
+                times, values = read_rows(data_file, -tail, None, index) if tail > 0 else (np.empty(0), np.empty(0))
+                label = f"last {len(times)} readings"
+            else:
+                times, values = read_rows(data_file, 0, head, index)
+                label = f"first {len(times)} readings"
         else:
-            header = "Simulation Time | " + " | ".join(f"Col_{i+1}" for i in range(num_columns))
-            column_names = [f"Col_{i+1}" for i in range(num_columns)]
-        
-        print(f"Printing first {n} readings from {os.path.basename(pickle_file)}:")
-        print(header)
-        print("-" * (len(header) + 10))
-        
-        for i in range(n):
-            sim_time, sensor_values = data[i]
-            if num_columns == 1:
-                print(f"{sim_time:.3f} s | {sensor_values[0]:.3f}")
+            times, values = read_legacy_pickle(data_file)
+            if summary:
+                print(f"{name}: {len(times)} rows (legacy pickle)")
+                return
+            if between is not None:
+                mask = (times >= between[0]) & (times <= between[1])
+                times, values = times[mask], values[mask]
+                label = f"readings between {between[0]:.3f} and {between[1]:.3f} s"
+            elif tail is not None:
+                start = max(len(times) - tail, 0)
+                times, values = times[start:], values[start:]
+                label = f"last {len(times)} readings"
             else:
-                values = [f"{val:.3f}" for val in sensor_values]
-                print(f"{sim_time:.3f} s | {' | '.join(values)}")
-    
+                times, values = times[:head], values[:head]
+                label = f"first {len(times)} readings"
+
+        if len(times) == 0:
+            print(f"No data available in {name}.")
+            return
+        print(f"Printing {label} from {name}:")
+        print_rows(times, values)
+
     except Exception as e:
-        print(f"Error reading pickle file: {e}")
+        print(f"Error reading sensor file: {e}")
 
-if __name__ == "__main__":
-    # Construct the pickle file path
-    sensors = [
-        "gyro", "accelerometer", "gps", "compass", "distance", 
-        "light", "touch", "actuator", "imu", "position_1", "position_2"
-    ]
+def non_negative_int(value):
+    """argparse type for --head / --tail counts."""
+    count = int(value)
+    if count < 0:
+        raise argparse.ArgumentTypeError(f"expected a count >= 0, got {value}")
+    return count
 
-    
-    pickle_file = "robot/controllers/drive_robot/data/2025-09-17-095442/gyro.pkl"
-    n_readings = 10 
-    
-    # Read and print the first n elements
-    read_pickle_data(pickle_file, n_readings)
+def sensor_files(path):
+    """
+    The sensor files to read for a path: the file itself, or every .bin (and legacy
+    .pkl) file in a session folder.
+    """
+    if not os.path.isdir(path):
+        return [path]
+    return sorted(
+        os.path.join(path, f) for f in os.listdir(path)
+        if f.endswith(".bin") or (f.endswith(".pkl") and not os.path.exists(os.path.join(path, f[:-4] + ".bin")))
+    )
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Inspect recorded sensor files without loading whole sessions.")
+    parser.add_argument("paths", nargs="+", help="Sensor files (.bin or .pkl) or session folders")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--head", type=non_negative_int, default=None, help="Print the first N readings (default 10)")
+    group.add_argument("--tail", type=non_negative_int, default=None, help="Print the last N readings")
+    group.add_argument("--between", type=float, nargs=2, metavar=("T0", "T1"), help="Print readings in a sim_time range")
+    group.add_argument("--summary", action="store_true", help="Print rows, time span, rate and min/max per sensor")
+    args = parser.parse_args()
 
-    for sensor in sensors:
-        pickle_file = f"robot/controllers/drive_robot/data/2025-09-22-155852/{sensor}.pkl"
-        read_pickle_data(pickle_file, n_readings)
\ No newline at end of file
+    head = args.head if args.head is not None else 10
+    for path in args.paths:
+        for data_file in sensor_files(path):
+            read_sensor_file(data_file, head=head, tail=args.tail, between=args.between, summary=args.summary)
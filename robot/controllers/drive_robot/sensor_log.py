@@ -0,0 +1,733 @@
+"""
+Append-only, chunked on-disk format for the drive_robot sensor logger.
+
+Each sensor gets one file laid out as:
+
+    file header : MAGIC | uint32 length | JSON {"sensor", "dtype", "shape"}
+    chunk       : CHUNK_HEADER | float64 sim_time[n] | float32 values[n, *shape]
+    chunk       : ...
+
+Chunks are written and flushed as soon as they fill, so memory stays flat however
+long the drive lasts, and a controller that is killed mid-run leaves every complete
+chunk readable. A truncated trailing chunk is ignored by the reader.
+
+Heavy frame sensors (depth) can store chunks zlib-compressed. The chunk headers carry
+the sim_time range of each chunk, so chunk_index() gives an offset index by sim_time
+and read_frame(), read_rows() and read_range() decode only the chunks they need.
+
+When a file is closed cleanly, ChunkWriter also writes a small sidecar, <name>.idx.json,
+holding the chunk index and a summary (rows, sim_time span, per-column min/max). Readers
+use it while it matches the file's size and fall back to walking the chunk headers.
+
+SensorLogger is the single background thread that receives one record per simulation
+step for all devices and dispatches each reading to a converter chosen by the sensor's
+"kind" in sensors.json.
+"""
+import os
+import json
+import pickle
+import queue
+import struct
+import threading
+import time
+import zlib
+from bisect import bisect_right
+from collections import deque
+import numpy as np
+
+MAGIC = b"FYNLOG1\n"
+CHUNK_MAGIC = b"CHNK"
+# magic, codec, n_rows, payload bytes, first sim_time, last sim_time
+CHUNK_HEADER = struct.Struct("<4sBxxxIQdd")
+CODEC_RAW = 0
+# zlib over the payload, with float32 values byte-shuffled into planes so they compress
+CODEC_ZLIB = 1
+CODECS = {"none": CODEC_RAW, "zlib": CODEC_ZLIB}
+
+DEFAULT_CHUNK_ROWS = 256
+# Rows with at most this many values get per-value min/max in the index summary
+MAX_STAT_COLUMNS = 16
+INDEX_FIELDS = ["offset", "codec", "rows", "nbytes", "t_first", "t_last"]
+INDEX_DTYPE = [("offset", "<u8"), ("codec", "u1"), ("rows", "<u4"), ("nbytes", "<u8"),
+               ("t_first", "<f8"), ("t_last", "<f8")]
+SENSORS_JSON = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sensors.json")
+
+
+def _as_is(raw):
+    # Lists and scalars (light, distance) are written straight into the preallocated row
+    return raw
+
+
+# Webots LidarPoint struct: float x, y, z; int layer_id; float time
+LIDAR_POINT_FIELDS = 5
+
+
+def _point_cloud_to_array(raw):
+    # Bulk path: getPointCloud(data_type="buffer") returns the raw struct array,
+    # which is viewed without touching any per-point Python objects
+    if isinstance(raw, (bytes, bytearray, memoryview)):
+        return np.frombuffer(raw, dtype=np.float32).reshape(-1, LIDAR_POINT_FIELDS)[:, :3]
+    return np.array([(p.x, p.y, p.z) for p in raw], dtype=np.float32) if raw else np.array([], dtype=np.float32)
+
+
+def _range_image_to_array(raw):
+    # getRangeImage(data_type="buffer") returns packed float32 distances
+    if isinstance(raw, (bytes, bytearray, memoryview)):
+        return np.frombuffer(raw, dtype=np.float32)
+    return raw
+
+
+# Converter per sensor "kind" in sensors.json
+CONVERTERS = {
+    "vector": _as_is,
+    "scalar": _as_is,
+    "point_cloud": _point_cloud_to_array,
+    "range_image": _range_image_to_array,
+}
+
+
+class SampleBuffer:
+    """
+    Preallocated rows for one sensor: a float64 time column and a float32 block of
+    shape (capacity, *shape), filled in place.
+
+    Two blocks are allocated up front. When the active one is full, swap() hands it
+    out for writing and continues filling the other, so steady-state logging makes
+    no per-sample allocations.
+    """
+
+    def __init__(self, shape, capacity=DEFAULT_CHUNK_ROWS):
+        self.shape = tuple(shape)
+        self.capacity = capacity
+        self._blocks = [
+            (np.empty(capacity, dtype=np.float64), np.empty((capacity,) + self.shape, dtype=np.float32))
+            for _ in range(2)
+        ]
+        self._active = 0
+        self.times, self.values = self._blocks[0]
+        self.size = 0
+
+    def append(self, sim_time, raw):
+        """
+        Store one sample in place. Returns True when the buffer is full.
+        Raises ValueError if the reading does not have the declared shape; a scalar is
+        only accepted for a one-value shape, so a bumper touch sensor's single value is
+        never broadcast into a 3-axis row.
+        """
+        shape = np.shape(raw)
+        if shape != self.shape and not (shape == () and self.shape == (1,)):
+            raise ValueError(f"reading has shape {shape}")
+        self.values[self.size] = raw
+        self.times[self.size] = sim_time
+        self.size += 1
+        return self.size == self.capacity
+
+    def swap(self):
+        """
+        Return (times, values) views of the filled rows and switch to the other block.
+        """
+        filled = self.times[:self.size], self.values[:self.size]
+        self._active ^= 1
+        self.times, self.values = self._blocks[self._active]
+        self.size = 0
+        return filled
+
+
+def index_path(path):
+    """
+    Path of the index sidecar for a sensor log, e.g. gyro.bin -> gyro.idx.json.
+    """
+    return os.path.splitext(path)[0] + ".idx.json"
+
+
+def _value_ranges(values):
+    # Finite min/max per value for small rows, per last axis for frames (lidar x, y, z),
+    # and over everything otherwise (depth)
+    n = len(values)
+    shape = values.shape[1:]
+    if int(np.prod(shape)) <= MAX_STAT_COLUMNS:
+        flat = values.reshape(n, -1)
+    elif len(shape) > 1:
+        flat = values.reshape(-1, shape[-1])
+    else:
+        flat = values.reshape(-1, 1)
+    finite = np.isfinite(flat)
+    return np.where(finite, flat, np.inf).min(axis=0), np.where(finite, flat, -np.inf).max(axis=0)
+
+
+class ChunkWriter:
+    """
+    Write fixed-size chunks of (sim_time, values) rows to an append-only sensor file,
+    and the index sidecar when the file is closed.
+    """
+
+    def __init__(self, path, sensor, shape, codec=CODEC_RAW, level=1):
+        self.path = path
+        self.sensor = sensor
+        self.shape = tuple(shape)
+        self.codec = codec
+        self.level = level
+        self.rows_written = 0
+        self.bytes_written = 0
+        self._chunks = []
+        self._min = None
+        self._max = None
+        self._file = open(path, "wb")
+        header = json.dumps({"sensor": sensor, "dtype": "float32", "shape": list(self.shape)}).encode()
+        self._write(MAGIC + struct.pack("<I", len(header)) + header)
+
+    def _write(self, payload):
+        self._file.write(payload)
+        # Hand the bytes to the OS so a killed controller still leaves them on disk
+        self._file.flush()
+        self.bytes_written += len(payload)
+
+    def write_chunk(self, times, values):
+        """
+        Append one chunk. times is a 1-D array of sim_time, values has shape (n, *shape).
+        """
+        times = np.ascontiguousarray(times, dtype=np.float64)
+        values = np.ascontiguousarray(values, dtype=np.float32).reshape((len(times),) + self.shape)
+        n = len(times)
+        if n == 0:
+            return
+        if self.codec == CODEC_ZLIB:
+            shuffled = values.view(np.uint8).reshape(-1, values.itemsize).T
+            payload = zlib.compress(times.tobytes() + shuffled.tobytes(), self.level)
+        else:
+            payload = times.tobytes() + values.tobytes()
+        header = CHUNK_HEADER.pack(CHUNK_MAGIC, self.codec, n, len(payload), times[0], times[-1])
+        # bytes_written is the file position, so the payload starts right after the header
+        self._chunks.append((self.bytes_written + CHUNK_HEADER.size, self.codec, n, len(payload),
+                             float(times[0]), float(times[-1])))
+        self._write(header + payload)
+        self.rows_written += n
+        low, high = _value_ranges(values)
+        self._min = low if self._min is None else np.minimum(self._min, low)
+        self._max = high if self._max is None else np.maximum(self._max, high)
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+            self._write_index()
+
+    def _write_index(self):
+        index = {
+            "sensor": self.sensor,
+            "shape": list(self.shape),
+            "file_size": self.bytes_written,
+            "rows": self.rows_written,
+            "t_first": self._chunks[0][4] if self._chunks else None,
+            "t_last": self._chunks[-1][5] if self._chunks else None,
+            "min": self._min.tolist() if self._min is not None else [],
+            "max": self._max.tolist() if self._max is not None else [],
+            "fields": INDEX_FIELDS,
+            "chunks": self._chunks,
+        }
+        path = index_path(self.path)
+        try:
+            with open(path + ".tmp", "w") as f:
+                json.dump(index, f)
+            os.replace(path + ".tmp", path)
+        except OSError as e:
+            print(f"Warning: Could not write the index for {self.path}: {e}")
+
+
+def read_header(f):
+    """
+    Read and validate the file header, returning the decoded metadata dict.
+    """
+    magic = f.read(len(MAGIC))
+    if magic != MAGIC:
+        raise ValueError(f"Not a sensor log file (bad magic {magic!r})")
+    (length,) = struct.unpack("<I", f.read(4))
+    return json.loads(f.read(length).decode())
+
+
+def iter_chunk_headers(path):
+    """
+    Walk the chunk headers without reading payloads.
+
+    Yields:
+        tuple: (payload offset, codec, n_rows, payload bytes, first sim_time, last sim_time)
+    """
+    size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        read_header(f)
+        while True:
+            raw = f.read(CHUNK_HEADER.size)
+            if len(raw) < CHUNK_HEADER.size:
+                break
+            magic, codec, n, nbytes, t_first, t_last = CHUNK_HEADER.unpack(raw)
+            offset = f.tell()
+            if magic != CHUNK_MAGIC or offset + nbytes > size:
+                break
+            yield offset, codec, n, nbytes, t_first, t_last
+            f.seek(nbytes, os.SEEK_CUR)
+
+
+def _decode(payload, codec, n, shape):
+    if codec == CODEC_ZLIB:
+        payload = zlib.decompress(payload)
+        times = np.frombuffer(payload, dtype=np.float64, count=n)
+        planes = np.frombuffer(payload, dtype=np.uint8, offset=8 * n).reshape(4, -1)
+        values = np.ascontiguousarray(planes.T).view(np.float32).reshape((n,) + shape)
+        return times, values
+    if codec != CODEC_RAW:
+        raise ValueError(f"Unknown chunk codec {codec}")
+    times = np.frombuffer(payload, dtype=np.float64, count=n)
+    values = np.frombuffer(payload, dtype=np.float32, offset=8 * n).reshape((n,) + shape)
+    return times, values
+
+
+def iter_chunks(path):
+    """
+    Yield (times, values) arrays for every complete chunk in a sensor log file.
+    """
+    with open(path, "rb") as f:
+        meta = read_header(f)
+        shape = tuple(meta["shape"])
+        while True:
+            raw = f.read(CHUNK_HEADER.size)
+            if len(raw) < CHUNK_HEADER.size:
+                break
+            magic, codec, n, nbytes, _, _ = CHUNK_HEADER.unpack(raw)
+            if magic != CHUNK_MAGIC:
+                break
+            payload = f.read(nbytes)
+            if len(payload) < nbytes:
+                # Trailing chunk cut short by a crash
+                break
+            yield _decode(payload, codec, n, shape)
+
+
+def read_index(path):
+    """
+    Load the index sidecar of a sensor log, or None if it is missing or stale (the log
+    is still being written, or the controller was killed before closing it).
+    """
+    try:
+        with open(index_path(path), "r") as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if index.get("file_size") != os.path.getsize(path):
+        return None
+    return index
+
+
+def chunk_index(path):
+    """
+    The offset index of a sensor log: from its sidecar when current, otherwise built
+    from the chunk headers.
+
+    Returns:
+        np.ndarray: structured array with offset, codec, rows, nbytes, t_first, t_last per chunk
+    """
+    index = read_index(path)
+    chunks = index["chunks"] if index is not None else list(iter_chunk_headers(path))
+    return np.array([tuple(c) for c in chunks], dtype=INDEX_DTYPE)
+
+
+def _read_chunks(path, entries):
+    # Decode the given index entries, seeking straight to each payload
+    with open(path, "rb") as f:
+        shape = tuple(read_header(f)["shape"])
+        decoded = []
+        for entry in entries:
+            f.seek(int(entry["offset"]))
+            payload = f.read(int(entry["nbytes"]))
+            decoded.append(_decode(payload, int(entry["codec"]), int(entry["rows"]), shape))
+    if not decoded:
+        return np.empty(0, dtype=np.float64), np.empty((0,) + shape, dtype=np.float32)
+    return np.concatenate([d[0] for d in decoded]), np.concatenate([d[1] for d in decoded])
+
+
+def read_rows(path, start=0, stop=None, index=None):
+    """
+    Read rows [start, stop) of a sensor log, decoding only the chunks that hold them.
+    Negative positions count from the end, so read_rows(path, -10) is the last 10 rows.
+
+    Returns:
+        tuple: (times float64 [n], values float32 [n, *shape])
+    """
+    if index is None:
+        index = chunk_index(path)
+    ends = np.cumsum(index["rows"], dtype=np.int64)
+    total = int(ends[-1]) if len(ends) else 0
+    start, stop, _ = slice(start, stop).indices(total)
+    stop = max(start, stop)
+    first = int(np.searchsorted(ends, start, side="right"))
+    last = int(np.searchsorted(ends, stop, side="left")) + 1 if stop > start else first
+    times, values = _read_chunks(path, index[first:last])
+    offset = int(ends[first - 1]) if first > 0 else 0
+    return times[start - offset:stop - offset], values[start - offset:stop - offset]
+
+
+def read_range(path, t_start, t_end, index=None):
+    """
+    Read the rows with t_start <= sim_time <= t_end, decoding only the chunks whose
+    sim_time span overlaps the range.
+
+    Returns:
+        tuple: (times float64 [n], values float32 [n, *shape])
+    """
+    if index is None:
+        index = chunk_index(path)
+    overlapping = index[(index["t_last"] >= t_start) & (index["t_first"] <= t_end)]
+    times, values = _read_chunks(path, overlapping)
+    mask = (times >= t_start) & (times <= t_end)
+    return times[mask], values[mask]
+
+
+def summarize(path):
+    """
+    Summary of a sensor log: rows, sim_time span, mean rate and per-column min/max.
+    Comes from the index sidecar when current; otherwise rows and span come from the
+    chunk headers and min/max from a pass over the data.
+
+    Returns:
+        dict: sensor, shape, rows, chunks, t_first, t_last, rate_hz, min, max, bytes, source
+    """
+    index = read_index(path)
+    if index is not None:
+        rows, chunks = index["rows"], len(index["chunks"])
+        t_first, t_last = index["t_first"], index["t_last"]
+        low, high = index["min"], index["max"]
+        with open(path, "rb") as f:
+            meta = read_header(f)
+        source = "index"
+    else:
+        with open(path, "rb") as f:
+            meta = read_header(f)
+        headers = chunk_index(path)
+        rows, chunks = int(headers["rows"].sum()), len(headers)
+        t_first = float(headers["t_first"][0]) if chunks else None
+        t_last = float(headers["t_last"][-1]) if chunks else None
+        low = high = None
+        for _, values in iter_chunks(path):
+            chunk_low, chunk_high = _value_ranges(values)
+            low = chunk_low if low is None else np.minimum(low, chunk_low)
+            high = chunk_high if high is None else np.maximum(high, chunk_high)
+        low = low.tolist() if low is not None else []
+        high = high.tolist() if high is not None else []
+        source = "scan"
+    span = (t_last - t_first) if rows > 1 else 0.0
+    return {
+        "sensor": meta["sensor"],
+        "shape": meta["shape"],
+        "rows": rows,
+        "chunks": chunks,
+        "t_first": t_first,
+        "t_last": t_last,
+        "rate_hz": (rows - 1) / span if span > 0 else 0.0,
+        "min": low,
+        "max": high,
+        "bytes": os.path.getsize(path),
+        "source": source,
+    }
+
+
+def read_frame(path, sim_time, index=None):
+    """
+    Random-access read of the last frame recorded at or before sim_time.
+    Only the chunk that holds the frame is read and decompressed.
+
+    Args:
+        path (str): Sensor log file
+        sim_time (float): Requested simulation time
+        index (np.ndarray, optional): Result of chunk_index(path), reused across calls
+
+    Returns:
+        tuple: (frame sim_time, frame values) or None if sim_time precedes the recording
+    """
+    if index is None:
+        index = chunk_index(path)
+    i = bisect_right(index["t_first"], sim_time) - 1
+    if i < 0:
+        return None
+    entry = index[i]
+    with open(path, "rb") as f:
+        shape = tuple(read_header(f)["shape"])
+        f.seek(int(entry["offset"]))
+        payload = f.read(int(entry["nbytes"]))
+    times, values = _decode(payload, int(entry["codec"]), int(entry["rows"]), shape)
+    j = int(np.searchsorted(times, sim_time, side="right")) - 1
+    return times[j], values[j]
+
+
+def read_log(path):
+    """
+    Read a whole sensor log into contiguous arrays.
+
+    Returns:
+        tuple: (times float64 [n], values float32 [n, *shape], metadata dict)
+    """
+    with open(path, "rb") as f:
+        meta = read_header(f)
+    shape = tuple(meta["shape"])
+    chunks = list(iter_chunks(path))
+    if not chunks:
+        return np.empty(0, dtype=np.float64), np.empty((0,) + shape, dtype=np.float32), meta
+    times = np.concatenate([c[0] for c in chunks])
+    values = np.concatenate([c[1] for c in chunks])
+    return times, values, meta
+
+
+def read_legacy_pickle(path):
+    """
+    Read a pickle file written by older controllers (a list of (sim_time, values) tuples).
+    Pickles have no index, so the whole file is read.
+
+    Returns:
+        tuple: (times float64 [n], values float64 [n, n_values])
+    """
+    with open(path, "rb") as f:
+        rows = pickle.load(f)
+    times = np.array([sim_time for sim_time, _ in rows], dtype=np.float64)
+    values = np.array([np.ravel(sensor_values) for _, sensor_values in rows], dtype=np.float64)
+    return times, values.reshape(len(rows), -1)
+
+
+def is_log_file(path):
+    """
+    Return True if path exists and starts with the sensor log magic.
+    """
+    if not os.path.exists(path):
+        return False
+    with open(path, "rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def load_sensors(sensors_json=SENSORS_JSON):
+    """
+    Load the sensor definitions from sensors.json.
+    """
+    with open(sensors_json, "r") as f:
+        return json.load(f)
+
+
+_STOP = object()
+
+
+class SensorLogger:
+    """
+    One logging thread for every device.
+
+    The control loop calls log() once per step with a dict of raw readings. The call
+    only enqueues the record; conversion and chunked writes happen on the logging
+    thread, which drains the queue in batches. The queue is bounded: when the writer
+    falls behind by max_queue steps, new steps are dropped and counted instead of
+    growing memory.
+
+    Health metrics (queue depth, samples and bytes written, flush latency, drops) are
+    appended to metrics_file every metrics_interval seconds and once more at close().
+
+    An optional publisher (e.g. step_stream.StepPublisher) receives every handled
+    record on the logging thread, so live streaming adds nothing to the control loop.
+    """
+
+    def __init__(self, data_dir, sensors, chunk_rows=DEFAULT_CHUNK_ROWS, batch_size=64,
+                 max_queue=1024, metrics_file=None, metrics_interval=5.0, publisher=None):
+        self.data_dir = data_dir
+        self.chunk_rows = chunk_rows
+        self.batch_size = batch_size
+        self.converters = {s["name"]: CONVERTERS[s.get("kind", "vector")] for s in sensors}
+        self.shapes = {s["name"]: tuple(s["shape"]) for s in sensors}
+        # Heavy sensors (lidar, depth) use smaller chunks to bound buffer memory
+        self.chunk_sizes = {s["name"]: s.get("chunk_rows", chunk_rows) for s in sensors}
+        self.codecs = {s["name"]: CODECS[s.get("compression", "none")] for s in sensors}
+        self.decimation = {s["name"]: s.get("decimation", 1) for s in sensors}
+        self.metrics_file = metrics_file or os.path.join(data_dir, "metrics.jsonl")
+        self.metrics_interval = metrics_interval
+        self.publisher = publisher
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._buffers = {}
+        self._writers = {}
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        # Per-step enqueue cost seen by the control thread
+        self.steps = 0
+        self._enqueue_total = 0.0
+        self._enqueue_max = 0.0
+        self._enqueue_recent = deque(maxlen=4096)
+        # Each counter is only written by one thread: enqueued/dropped by the control
+        # thread, handled/invalid/flush timings by the logging thread
+        self.dropped_steps = 0
+        self._enqueued = dict.fromkeys(self.converters, 0)
+        self._dropped = dict.fromkeys(self.converters, 0)
+        self._handled = dict.fromkeys(self.converters, 0)
+        self._invalid = {}
+        self._flush_count = {}
+        self._flush_total = {}
+        self._flush_max = {}
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def due(self, name):
+        """
+        Return True if the sensor should be read and logged on the upcoming step,
+        honouring its "decimation" in sensors.json (log every Nth step).
+        """
+        return self.steps % self.decimation.get(name, 1) == 0
+
+    def log(self, sim_time, readings):
+        """
+        Enqueue one step's readings, a dict of sensor name -> raw value.
+        The step is dropped and counted if the logging thread is max_queue steps behind.
+        """
+        start = time.perf_counter()
+        try:
+            self._queue.put_nowait((sim_time, readings))
+            counts = self._enqueued
+        except queue.Full:
+            self.dropped_steps += 1
+            counts = self._dropped
+        for name in readings:
+            counts[name] = counts.get(name, 0) + 1
+        elapsed = time.perf_counter() - start
+        self.steps += 1
+        self._enqueue_total += elapsed
+        self._enqueue_max = max(self._enqueue_max, elapsed)
+        self._enqueue_recent.append(elapsed)
+
+    def queue_depth(self):
+        """
+        Number of step records waiting for the logging thread.
+        """
+        return self._queue.qsize()
+
+    def enqueue_stats(self):
+        """
+        Return the per-step enqueue cost on the control thread in microseconds.
+        Percentiles are taken over the most recent steps.
+        """
+        if not self.steps:
+            return {"steps": 0, "mean_us": 0.0, "p50_us": 0.0, "p99_us": 0.0, "max_us": 0.0}
+        recent = np.array(self._enqueue_recent) * 1e6
+        return {
+            "steps": self.steps,
+            "mean_us": self._enqueue_total / self.steps * 1e6,
+            "p50_us": float(np.percentile(recent, 50)),
+            "p99_us": float(np.percentile(recent, 99)),
+            "max_us": self._enqueue_max * 1e6,
+        }
+
+    def metrics(self):
+        """
+        Snapshot of logger health, overall and per sensor.
+        """
+        sensors = {}
+        for name in sorted(set(self._enqueued) | set(self._dropped)):
+            if not self._enqueued.get(name) and not self._dropped.get(name):
+                continue
+            writer = self._writers.get(name)
+            buffer = self._buffers.get(name)
+            flushes = self._flush_count.get(name, 0)
+            sensors[name] = {
+                "queued": self._enqueued.get(name, 0) - self._handled.get(name, 0),
+                "buffered": buffer.size if buffer is not None else 0,
+                "samples_written": writer.rows_written if writer is not None else 0,
+                "bytes_written": writer.bytes_written if writer is not None else 0,
+                "dropped": self._dropped.get(name, 0),
+                "invalid": self._invalid.get(name, 0),
+                "flushes": flushes,
+                "flush_ms_mean": self._flush_total.get(name, 0.0) / flushes * 1e3 if flushes else 0.0,
+                "flush_ms_max": self._flush_max.get(name, 0.0) * 1e3,
+            }
+        return {
+            "wall_time": time.time(),
+            "steps": self.steps,
+            "queue_depth": self.queue_depth(),
+            "dropped_steps": self.dropped_steps,
+            "enqueue_us": self.enqueue_stats(),
+            "sensors": sensors,
+        }
+
+    def _write_metrics(self, final=False):
+        snapshot = self.metrics()
+        snapshot["final"] = final
+        try:
+            with open(self.metrics_file, "a") as f:
+                f.write(json.dumps(snapshot) + "\n")
+        except OSError as e:
+            print(f"Warning: Could not write logger metrics to {self.metrics_file}: {e}")
+
+    def _run(self):
+        next_report = time.monotonic() + self.metrics_interval
+        while True:
+            try:
+                batch = [self._queue.get(timeout=self.metrics_interval)]
+            except queue.Empty:
+                batch = []
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            for record in batch:
+                if record is _STOP:
+                    self._flush_all()
+                    return
+                self._handle(record)
+            if time.monotonic() >= next_report:
+                self._write_metrics()
+                next_report = time.monotonic() + self.metrics_interval
+
+    def _handle(self, record):
+        sim_time, readings = record
+        for name, raw in readings.items():
+            self._handled[name] = self._handled.get(name, 0) + 1
+            convert = self.converters.get(name)
+            if convert is None:
+                if name not in self._invalid:
+                    print(f"Warning: Unknown sensor type {name}")
+                self._invalid[name] = self._invalid.get(name, 0) + 1
+                continue
+            buffer = self._buffers.get(name)
+            if buffer is None:
+                buffer = self._buffers[name] = SampleBuffer(self.shapes[name], self.chunk_sizes[name])
+            try:
+                full = buffer.append(sim_time, convert(raw))
+            except ValueError as e:
+                if name not in self._invalid:
+                    print(f"Warning: Dropping {name} samples that do not match shape {self.shapes[name]}: {e}")
+                self._invalid[name] = self._invalid.get(name, 0) + 1
+                continue
+            if full:
+                self._flush(name)
+        if self.publisher is not None:
+            self.publisher.publish(sim_time, readings)
+
+    def _flush(self, name):
+        buffer = self._buffers[name]
+        if buffer.size == 0:
+            return
+        start = time.perf_counter()
+        writer = self._writers.get(name)
+        if writer is None:
+            writer = ChunkWriter(
+                os.path.join(self.data_dir, f"{name}.bin"), name, buffer.shape, codec=self.codecs[name]
+            )
+            self._writers[name] = writer
+        writer.write_chunk(*buffer.swap())
+        elapsed = time.perf_counter() - start
+        self._flush_count[name] = self._flush_count.get(name, 0) + 1
+        self._flush_total[name] = self._flush_total.get(name, 0.0) + elapsed
+        self._flush_max[name] = max(self._flush_max.get(name, 0.0), elapsed)
+
+    def _flush_all(self):
+        for name in self._buffers:
+            self._flush(name)
+
+    def close(self):
+        """
+        Write everything still queued, close all sensor files and append the final
+        metrics snapshot.
+        """
+        self._queue.put(_STOP)
+        self._thread.join()
+        for writer in self._writers.values():
+            writer.close()
+        self._write_metrics(final=True)
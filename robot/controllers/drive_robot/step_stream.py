@@ -0,0 +1,126 @@
+"""
+Live shared-memory stream of per-step sensor readings.
+
+StepPublisher owns a shared-memory block laid out as
+
+    header : MAGIC | uint32 capacity | uint32 slot bytes | uint64 steps published |
+             uint32 layout length | JSON layout, padded to HEADER_SIZE
+    slots  : capacity x [uint64 seq | float64 sim_time | uint8 valid[n] | float32 values]
+
+Each slot is guarded by its sequence number (0 while being written), so a reader in
+another process can take zero-copy NumPy views of a slot and detect when the ring
+has lapped it. The consumer side lives in fynesse/live.py; keep the two in sync.
+"""
+import json
+import struct
+import numpy as np
+from multiprocessing import shared_memory
+
+MAGIC = b"FYNSTRM1"
+HEADER_SIZE = 4096
+# magic, capacity, slot bytes, steps published, layout length
+HEADER = struct.Struct("<8sIIQI")
+STEPS_OFFSET = 16
+DEFAULT_CAPACITY = 1024
+
+
+def stream_layout(sensors):
+    """
+    Compute the slot layout for the streamed sensors.
+
+    Returns:
+        tuple: (layout dict stored in the header, slot size in bytes)
+    """
+    n = len(sensors)
+    # seq + sim_time, then one valid flag per sensor padded to 8 bytes
+    offset = 16 + (n + 7) // 8 * 8
+    fields = []
+    for s in sensors:
+        size = int(np.prod(s["shape"]))
+        fields.append({
+            "name": s["name"],
+            "shape": list(s["shape"]),
+            "offset": offset,
+            "columns": s.get("csv_columns", []),
+        })
+        offset += 4 * size
+    slot_size = (offset + 7) // 8 * 8
+    return {"fields": fields}, slot_size
+
+
+class StepPublisher:
+    """
+    Publish one record per step into a shared-memory ring.
+
+    Args:
+        name (str): Shared-memory block name consumers attach to.
+        sensors (list): sensors.json entries to stream. Frame sensors (lidar, depth)
+            are excluded by default by the caller, since each slot holds every sensor.
+        capacity (int): Number of steps kept in the ring.
+    """
+
+    def __init__(self, name, sensors, capacity=DEFAULT_CAPACITY):
+        self.name = name
+        self.capacity = capacity
+        layout, self.slot_size = stream_layout(sensors)
+        encoded = json.dumps(layout).encode()
+        if HEADER.size + len(encoded) > HEADER_SIZE:
+            raise ValueError("Stream layout does not fit in the shared-memory header")
+        self._shm = shared_memory.SharedMemory(name=name, create=True, size=HEADER_SIZE + capacity * self.slot_size)
+        buf = self._shm.buf
+        buf[:HEADER.size] = HEADER.pack(MAGIC, capacity, self.slot_size, 0, len(encoded))
+        buf[HEADER.size:HEADER.size + len(encoded)] = encoded
+        # np.frombuffer keeps the block exported, so it cannot be unmapped under live views
+        self._steps = np.frombuffer(buf, dtype=np.uint64, count=1, offset=STEPS_OFFSET)
+        ring = np.frombuffer(buf, dtype=np.uint8, count=capacity * self.slot_size, offset=HEADER_SIZE).reshape(
+            capacity, self.slot_size
+        )
+        self._seq = ring[:, 0:8].view(np.uint64)[:, 0]
+        self._seq[:] = 0
+        self._time = ring[:, 8:16].view(np.float64)[:, 0]
+        n = len(layout["fields"])
+        self._valid = ring[:, 16:16 + n]
+        self._index = {}
+        self._values = {}
+        for i, field in enumerate(layout["fields"]):
+            size = int(np.prod(field["shape"]))
+            start = field["offset"]
+            self._index[field["name"]] = i
+            self._values[field["name"]] = ring[:, start:start + 4 * size].view(np.float32).reshape(
+                (capacity,) + tuple(field["shape"])
+            )
+        self.published = 0
+
+    def publish(self, sim_time, readings):
+        """
+        Write one step's raw readings (sensor name -> value) into the next slot.
+        Sensors missing from readings on this step are marked invalid.
+        """
+        slot = self.published % self.capacity
+        self._seq[slot] = 0
+        self._time[slot] = sim_time
+        self._valid[slot] = 0
+        for name, raw in readings.items():
+            values = self._values.get(name)
+            if values is None:
+                continue
+            try:
+                values[slot] = raw
+            except ValueError:
+                continue
+            self._valid[slot, self._index[name]] = 1
+        self.published += 1
+        self._seq[slot] = self.published
+        self._steps[0] = self.published
+
+    def close(self):
+        """
+        Release and remove the shared-memory block.
+        """
+        self._seq = self._time = self._valid = self._steps = None
+        self._values = {}
+        try:
+            self._shm.close()
+        except BufferError:
+            pass
+        self._shm.unlink()